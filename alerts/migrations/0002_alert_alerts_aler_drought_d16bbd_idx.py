@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("alerts", "0001_initial"),
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        ("drought_data", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="alert",
+            index=models.Index(
+                fields=["drought_assessment", "status"],
+                name="alerts_aler_drought_d16bbd_idx",
+            ),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 from core.models import Region, UserProfile
@@ -138,10 +140,22 @@ class Alert(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['drought_assessment', 'status']),
+        ]
     
     def __str__(self):
         return f"Alert {self.alert_id}: {self.title}"
     
+    @staticmethod
+    def generate_batch_alert_ids(count):
+        """
+        Generate unique alert IDs for alerts saved together with bulk_create.
+        Each is ALT plus 17 random hex digits, filling alert_id's 20
+        characters, so IDs don't collide across batches started together.
+        """
+        return [f"ALT{uuid.uuid4().hex[:17].upper()}" for _ in range(count)]
+    
     def save(self, *args, **kwargs):
         if not self.alert_id:
             # Generate unique alert ID
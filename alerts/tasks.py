@@ -162,11 +162,11 @@ def check_and_send_automated_alerts() -> Dict[str, Any]:
     
     # Check recent risk assessments
     today = timezone.now().date()
-    recent_assessments = DroughtRiskAssessment.objects.filter(
+    recent_assessments = list(DroughtRiskAssessment.objects.filter(
         assessment_date=today
-    )
+    ).select_related('region'))
     
-    results['regions_checked'] = recent_assessments.count()
+    results['regions_checked'] = len(recent_assessments)
     
     for assessment in recent_assessments:
         for template in auto_templates:
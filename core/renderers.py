@@ -0,0 +1,29 @@
+"""
+JSON renderer for the API built on orjson
+"""
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders JSON with orjson, which encodes dates, datetimes, floats and
+    numpy values in C. Other types, such as Decimal or lazy translation
+    strings, fall back to DRF's JSONEncoder.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=options)
+
+        # Escape line and paragraph separators as JSONRenderer does, so the
+        # output stays a strict JavaScript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -24,6 +24,13 @@ class RegionSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Region
         fields = ['id', 'name', 'region_type', 'full_name']
+    
+    def to_representation(self, instance):
+        # Rows embedding the same region share one rendering per response
+        rendered = self.context.setdefault('rendered_regions', {})
+        if instance.pk not in rendered:
+            rendered[instance.pk] = super().to_representation(instance)
+        return rendered[instance.pk]
 
 
 class UserSerializer(serializers.ModelSerializer):
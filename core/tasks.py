@@ -1,4 +1,5 @@
 from celery import shared_task
+from django.db import connections, router
 from django.utils import timezone
 from datetime import datetime, timedelta
 import logging
@@ -11,6 +12,27 @@ from alerts.models import Alert, AlertDelivery
 logger = logging.getLogger(__name__)
 
 
+def delete_expired_readings(model, cutoff_date):
+    """
+    Delete a reading model's rows dated before cutoff_date in a single
+    DELETE statement, returning the number of rows deleted
+    
+    QuerySet.delete() loads every row to send the post_delete signals
+    that invalidate cached component scores. Readings past the retention
+    cutoff only feed scores for long-past dates, and no table references
+    the reading tables, so neither signals nor cascades are needed.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {quote_name(model._meta.db_table)} "
+            f"WHERE {quote_name(model._meta.get_field('date').column)} < %s",
+            [cutoff_date]
+        )
+        return cursor.rowcount
+
+
 @shared_task
 def cleanup_old_data(days_to_keep: int = 90) -> Dict[str, Any]:
     """
@@ -25,22 +47,13 @@ def cleanup_old_data(days_to_keep: int = 90) -> Dict[str, Any]:
     
     try:
         # Clean up old NDVI data (keep recent + monthly samples)
-        old_ndvi = NDVIData.objects.filter(date__lt=cutoff_date)
-        ndvi_count = old_ndvi.count()
-        old_ndvi.delete()
-        results['deleted_records']['ndvi_data'] = ndvi_count
+        results['deleted_records']['ndvi_data'] = delete_expired_readings(NDVIData, cutoff_date)
         
         # Clean up old soil moisture data
-        old_soil = SoilMoistureData.objects.filter(date__lt=cutoff_date)
-        soil_count = old_soil.count()
-        old_soil.delete()
-        results['deleted_records']['soil_moisture_data'] = soil_count
+        results['deleted_records']['soil_moisture_data'] = delete_expired_readings(SoilMoistureData, cutoff_date)
         
         # Clean up old weather data
-        old_weather = WeatherData.objects.filter(date__lt=cutoff_date)
-        weather_count = old_weather.count()
-        old_weather.delete()
-        results['deleted_records']['weather_data'] = weather_count
+        results['deleted_records']['weather_data'] = delete_expired_readings(WeatherData, cutoff_date)
         
         # Clean up old risk assessments (keep monthly samples)
         old_assessments = DroughtRiskAssessment.objects.filter(assessment_date__lt=cutoff_date)
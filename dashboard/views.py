@@ -4,7 +4,8 @@ from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.models import User
 from django.contrib import messages
 from django.http import JsonResponse
-from django.db.models import Count, Avg, Q, Max
+from django.db.models import Count, Avg, Q, Max, Func, Value, CharField
+from django.db.models.functions import Coalesce
 from django.db import models
 from django.utils import timezone
 from datetime import datetime, timedelta
@@ -118,12 +119,12 @@ def risk_map(request):
     """
     # Get latest assessments for all regions
     regions_data = []
-    regions = Region.objects.filter(region_type='county')
+    regions = Region.objects.filter(region_type='county').prefetch_related(
+        DroughtRiskAssessment.objects.recent_prefetch('latest_assessments')
+    )
     
     for region in regions:
-        latest_assessment = DroughtRiskAssessment.objects.filter(
-            region=region
-        ).order_by('-assessment_date').first()
+        latest_assessment = next(iter(region.latest_assessments), None)
         
         region_data = {
             'id': region.id,
@@ -363,14 +364,14 @@ def api_regional_summary(request):
     """
     API endpoint for regional summary data
     """
-    regions = Region.objects.filter(region_type='county')
+    regions = Region.objects.filter(region_type='county').prefetch_related(
+        DroughtRiskAssessment.objects.recent_prefetch('latest_assessments')
+    )
     summary_data = []
     
     for region in regions:
         # Latest risk assessment
-        latest_assessment = DroughtRiskAssessment.objects.filter(
-            region=region
-        ).order_by('-assessment_date').first()
+        latest_assessment = next(iter(region.latest_assessments), None)
         
         # Count of farmers in this region
         farmer_count = FarmerProfile.objects.filter(
@@ -915,6 +916,37 @@ def admin_bulk_alert(request):
     return redirect('dashboard:admin_alerts')
 
 
+class _DateTimeText(Func):
+    """
+    Format a datetime column as 'YYYY-MM-DD HH:MM:SS' text inside the database
+    """
+    function = 'TO_CHAR'
+    output_field = CharField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value('YYYY-MM-DD HH24:MI:SS'), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        clone = self.copy()
+        clone.set_source_expressions([Value('%Y-%m-%d %H:%M:%S'), self.get_source_expressions()[0]])
+        return clone.as_sql(compiler, connection, function='STRFTIME', **extra_context)
+
+
+_CSV_SPECIAL_CHARS = frozenset(',"\r\n')
+
+
+def _write_csv_row(response, writer, row, text_columns):
+    """
+    Write a CSV row directly, using the csv writer only when a free-text cell needs quoting
+    """
+    for index in text_columns:
+        value = row[index]
+        if isinstance(value, str) and not _CSV_SPECIAL_CHARS.isdisjoint(value):
+            writer.writerow(row)
+            return
+    response.write(','.join('' if value is None else str(value) for value in row) + '\r\n')
+
+
 @permission_required('admin_dashboard')
 def admin_export_data(request):
     """
@@ -941,27 +973,33 @@ def admin_export_data(request):
         # Export user data
         writer.writerow(['Username', 'Email', 'Full Name', 'User Type', 'Region', 'Phone', 'Date Joined', 'Last Login'])
         
-        users = User.objects.select_related('userprofile').order_by('-date_joined')
+        users = User.objects.select_related('userprofile').annotate(
+            date_joined_text=_DateTimeText('date_joined'),
+            last_login_text=Coalesce(_DateTimeText('last_login'), Value('Never')),
+        ).order_by('-date_joined')
         for user in users:
             profile = getattr(user, 'userprofile', None)
-            writer.writerow([
+            _write_csv_row(response, writer, [
                 user.username,
                 user.email,
                 user.get_full_name(),
                 profile.user_type if profile else 'N/A',
                 profile.region.name if profile and profile.region else 'N/A',
                 profile.phone_number if profile else 'N/A',
-                user.date_joined.strftime('%Y-%m-%d %H:%M:%S'),
-                user.last_login.strftime('%Y-%m-%d %H:%M:%S') if user.last_login else 'Never'
-            ])
+                user.date_joined_text,
+                user.last_login_text
+            ], text_columns=(1, 2, 4, 5))
     
     elif export_type == 'alerts':
         # Export alert data
         writer.writerow(['Alert ID', 'Title', 'Region', 'Type', 'Severity', 'Status', 'Created By', 'Created At', 'Sent At'])
         
-        alerts = Alert.objects.select_related('region', 'created_by').order_by('-created_at')
+        alerts = Alert.objects.select_related('region', 'created_by').annotate(
+            created_at_text=_DateTimeText('created_at'),
+            sent_at_text=Coalesce(_DateTimeText('sent_at'), Value('Not sent')),
+        ).order_by('-created_at')
         for alert in alerts:
-            writer.writerow([
+            _write_csv_row(response, writer, [
                 alert.alert_id,
                 alert.title,
                 alert.region.name,
@@ -969,24 +1007,27 @@ def admin_export_data(request):
                 alert.severity_level,
                 alert.status,
                 alert.created_by.username,
-                alert.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                alert.sent_at.strftime('%Y-%m-%d %H:%M:%S') if alert.sent_at else 'Not sent'
-            ])
+                alert.created_at_text,
+                alert.sent_at_text
+            ], text_columns=(1, 2))
     
     elif export_type == 'ussd_users':
         # Export USSD user data
         writer.writerow(['Phone Number', 'Full Name', 'Region', 'Farm Size', 'Primary Crops', 'Registration Date', 'Last Activity'])
         
-        ussd_users = USSDUser.objects.select_related('region').order_by('-registration_date')
+        ussd_users = USSDUser.objects.select_related('region').annotate(
+            registration_date_text=_DateTimeText('registration_date'),
+            last_activity_text=_DateTimeText('last_activity'),
+        ).order_by('-registration_date')
         for user in ussd_users:
-            writer.writerow([
+            _write_csv_row(response, writer, [
                 user.phone_number,
                 user.full_name,
                 user.region.name if user.region else 'N/A',
                 user.farm_size_acres or 'N/A',
                 user.primary_crops,
-                user.registration_date.strftime('%Y-%m-%d %H:%M:%S'),
-                user.last_activity.strftime('%Y-%m-%d %H:%M:%S')
-            ])
+                user.registration_date_text,
+                user.last_activity_text
+            ], text_columns=(1, 2, 4))
     
     return response
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DroughtDataConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "drought_data"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,26 +1,48 @@
 """
 Automated tasks for drought risk calculation and alert triggering
 """
+import functools
+import itertools
 import logging
+import re
+import numpy as np
 from datetime import datetime, timedelta
 from django.utils import timezone
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Avg, Count, Q
-from celery import shared_task
+from django.db.models import Avg, Case, CharField, Count, Q, F, Sum, Value, When, Window
+from django.db.models.functions import RowNumber
+from celery import chord, group, shared_task
 
 from core.models import Region
 from .models import WeatherData, NDVIData, SoilMoistureData, DroughtRiskAssessment
-from .ml_models import DroughtRiskPredictor
+from .signals import component_score_cache_key, COMPONENT_SCORE_CACHE_TIMEOUT
 from alerts.models import Alert, AlertTemplate
 from alerts.tasks import send_alert
 
 logger = logging.getLogger(__name__)
 
+# Regions assessed together per batch of queries and inserts
+REGION_CHUNK_SIZE = 500
+
+# Minimum risk score for each alert (severity, alert_type), highest first.
+# Scores below the last threshold do not trigger an alert.
+ALERT_SEVERITY_THRESHOLDS = [
+    (80, 'critical', 'drought_warning'),
+    (65, 'high', 'drought_warning'),
+    (50, 'moderate', 'water_stress'),
+]
+
 
 @shared_task(bind=True, max_retries=3)
-def calculate_daily_drought_risk(self, region_id=None):
+def calculate_daily_drought_risk(self, region_id=None, parallel=False, detailed=False):
     """
     Calculate drought risk assessments for all regions or a specific region
+    
+    With parallel=True every region is assessed by its own
+    calculate_daily_drought_risk_one subtask so that workers process regions
+    concurrently, and merge_drought_risk_results combines their results.
+    Per-region results are only returned when detailed=True.
     """
     try:
         logger.info(f"Starting daily drought risk calculation for region_id={region_id}")
@@ -30,64 +52,130 @@ def calculate_daily_drought_risk(self, region_id=None):
             regions = Region.objects.filter(id=region_id, region_type='county')
         else:
             regions = Region.objects.filter(region_type='county')
+        regions = regions.only('id', 'name')
         
         if not regions.exists():
             logger.warning("No regions found for drought risk calculation")
             return {"status": "warning", "message": "No regions found"}
         
-        today = timezone.now().date()
-        results = {
-            "processed_regions": 0,
-            "assessments_created": 0,
-            "errors": 0,
-            "region_results": []
-        }
+        if parallel and not region_id:
+            region_ids = list(regions.values_list('id', flat=True))
+            chord_result = chord(
+                calculate_daily_drought_risk_one.s(region_id, detailed) for region_id in region_ids
+            )(merge_drought_risk_results.s())
+            logger.info(f"Dispatched drought risk calculation for {len(region_ids)} regions")
+            return {"status": "dispatched", "regions": len(region_ids), "task_id": chord_result.id}
         
-        predictor = DroughtRiskPredictor()
+        return assess_drought_risk(regions, detailed)
         
-        for region in regions:
+    except Exception as e:
+        logger.error(f"Fatal error in drought risk calculation: {str(e)}")
+        if self.request.retries < self.max_retries:
+            logger.info(f"Retrying task, attempt {self.request.retries + 1}")
+            raise self.retry(countdown=60, exc=e)
+        raise
+
+
+@shared_task(bind=True, max_retries=3)
+def calculate_daily_drought_risk_one(self, region_id, detailed=False):
+    """
+    Calculate today's drought risk assessment for a single region
+    """
+    try:
+        regions = Region.objects.filter(id=region_id, region_type='county').only('id', 'name')
+        return assess_drought_risk(regions, detailed)
+        
+    except Exception as e:
+        logger.error(f"Fatal error in drought risk calculation for region_id={region_id}: {str(e)}")
+        if self.request.retries < self.max_retries:
+            logger.info(f"Retrying task, attempt {self.request.retries + 1}")
+            raise self.retry(countdown=60, exc=e)
+        raise
+
+
+@shared_task
+def merge_drought_risk_results(region_results):
+    """
+    Combine the results of calculate_daily_drought_risk_one subtasks
+    """
+    results = {
+        "processed_regions": 0,
+        "assessments_created": 0,
+        "errors": 0,
+        "region_results": []
+    }
+    
+    for region_result in region_results:
+        results["processed_regions"] += region_result["processed_regions"]
+        results["assessments_created"] += region_result["assessments_created"]
+        results["errors"] += region_result["errors"]
+        results["region_results"].extend(region_result["region_results"])
+    
+    logger.info(f"Drought risk calculation completed: {results}")
+    return results
+
+
+def assess_drought_risk(regions, detailed=False):
+    """
+    Calculate and save today's drought risk assessments for the given regions
+    
+    Per-region results are logged as they are produced and only kept in
+    results["region_results"] when `detailed` is set, so large runs return
+    just the counts.
+    """
+    today = timezone.now().date()
+    results = {
+        "processed_regions": 0,
+        "assessments_created": 0,
+        "errors": 0,
+        "region_results": []
+    }
+    
+    def record_result(region_result):
+        logger.info(f"Drought risk result: {region_result}")
+        if detailed:
+            results["region_results"].append(region_result)
+    
+    # Get recent data (last 30 days) in one query per source for each chunk of
+    # regions, streaming regions from the database instead of loading them all
+    end_date = today
+    start_date = end_date - timedelta(days=30)
+    
+    for region_chunk in iter_chunks(regions.iterator(chunk_size=REGION_CHUNK_SIZE), REGION_CHUNK_SIZE):
+        region_ids = [region.id for region in region_chunk]
+        
+        component_scores = get_component_scores(region_ids, start_date, end_date)
+        
+        existing_region_ids = set(DroughtRiskAssessment.objects.filter(
+            region_id__in=region_ids,
+            assessment_date=today
+        ).values_list('region_id', flat=True))
+        
+        to_create = []
+        
+        for region in region_chunk:
             try:
                 logger.info(f"Processing drought risk for region: {region.name}")
                 
                 # Check if assessment already exists for today
-                existing_assessment = DroughtRiskAssessment.objects.filter(
-                    region=region,
-                    assessment_date=today
-                ).first()
-                
-                if existing_assessment:
+                if region.id in existing_region_ids:
                     logger.info(f"Assessment already exists for {region.name} on {today}")
-                    results["region_results"].append({
+                    record_result({
                         "region": region.name,
                         "status": "skipped",
                         "message": "Assessment already exists"
                     })
                     continue
                 
-                # Get recent data (last 30 days)
-                end_date = today
-                start_date = end_date - timedelta(days=30)
-                
-                # Collect data for the region
-                weather_data = WeatherData.objects.filter(
-                    region=region,
-                    date__range=[start_date, end_date]
-                ).order_by('-date')
-                
-                ndvi_data = NDVIData.objects.filter(
-                    region=region,
-                    date__range=[start_date, end_date]
-                ).order_by('-date')
-                
-                soil_data = SoilMoistureData.objects.filter(
-                    region=region,
-                    date__range=[start_date, end_date]
-                ).order_by('-date')
+                # Component scores (None when a source has no recent data)
+                weather_score = component_scores['weather'].get(region.id)
+                ndvi_score = component_scores['ndvi'].get(region.id)
+                soil_score = component_scores['soil'].get(region.id)
                 
                 # Check if we have sufficient data
-                if not weather_data.exists() and not ndvi_data.exists() and not soil_data.exists():
+                if weather_score is None and ndvi_score is None and soil_score is None:
                     logger.warning(f"Insufficient data for {region.name}")
-                    results["region_results"].append({
+                    record_result({
                         "region": region.name,
                         "status": "insufficient_data",
                         "message": "No recent data available"
@@ -95,11 +183,6 @@ def calculate_daily_drought_risk(self, region_id=None):
                     results["errors"] += 1
                     continue
                 
-                # Calculate component scores
-                weather_score = calculate_weather_drought_score(weather_data)
-                ndvi_score = calculate_ndvi_drought_score(ndvi_data)
-                soil_score = calculate_soil_drought_score(soil_data)
-                
                 # Calculate overall risk score using weighted average
                 weights = {"weather": 0.4, "ndvi": 0.3, "soil": 0.3}
                 
@@ -114,7 +197,7 @@ def calculate_daily_drought_risk(self, region_id=None):
                 
                 if not available_scores:
                     logger.warning(f"No valid component scores for {region.name}")
-                    results["region_results"].append({
+                    record_result({
                         "region": region.name,
                         "status": "no_valid_scores",
                         "message": "Could not calculate component scores"
@@ -130,53 +213,27 @@ def calculate_daily_drought_risk(self, region_id=None):
                 risk_score = sum(available_scores[comp] * normalized_weights[comp] 
                                for comp in available_scores.keys())
                 
-                # Use ML model for prediction if we have sufficient data
-                try:
-                    ml_predictions = predictor.predict_drought_risk(region, today)
-                    predicted_risk_7_days = ml_predictions.get('7_day_risk')
-                    predicted_risk_30_days = ml_predictions.get('30_day_risk')
-                    confidence_score = ml_predictions.get('confidence', 0.5)
-                except Exception as e:
-                    logger.warning(f"ML prediction failed for {region.name}: {str(e)}")
-                    predicted_risk_7_days = None
-                    predicted_risk_30_days = None
-                    confidence_score = 0.3
-                
                 # Generate recommendations
                 recommendations = generate_drought_recommendations(
                     risk_score, available_scores, region
                 )
                 
-                # Create drought risk assessment
-                with transaction.atomic():
-                    assessment = DroughtRiskAssessment.objects.create(
-                        region=region,
-                        assessment_date=today,
-                        risk_score=risk_score,
-                        ndvi_component_score=ndvi_score or 0,
-                        soil_moisture_component_score=soil_score or 0,
-                        weather_component_score=weather_score or 0,
-                        predicted_risk_7_days=predicted_risk_7_days,
-                        predicted_risk_30_days=predicted_risk_30_days,
-                        confidence_score=confidence_score,
-                        recommended_actions=recommendations
-                    )
-                
-                logger.info(f"Created assessment for {region.name}: risk_score={risk_score:.1f}, risk_level={assessment.risk_level}")
-                
-                results["assessments_created"] += 1
-                results["region_results"].append({
-                    "region": region.name,
-                    "status": "success",
-                    "risk_score": risk_score,
-                    "risk_level": assessment.risk_level,
-                    "assessment_id": assessment.id
-                })
+                # Queue drought risk assessment for a single bulk insert
+                to_create.append(DroughtRiskAssessment(
+                    region=region,
+                    assessment_date=today,
+                    risk_score=risk_score,
+                    ndvi_component_score=ndvi_score or 0,
+                    soil_moisture_component_score=soil_score or 0,
+                    weather_component_score=weather_score or 0,
+                    confidence_score=0.3,  # Rule-based score, no 7/30 day forecast model
+                    recommended_actions=recommendations
+                ))
                 
             except Exception as e:
                 logger.error(f"Error processing region {region.name}: {str(e)}")
                 results["errors"] += 1
-                results["region_results"].append({
+                record_result({
                     "region": region.name,
                     "status": "error",
                     "message": str(e)
@@ -184,15 +241,35 @@ def calculate_daily_drought_risk(self, region_id=None):
             
             results["processed_regions"] += 1
         
-        logger.info(f"Drought risk calculation completed: {results}")
-        return results
+        # Create this chunk's drought risk assessments
+        try:
+            with transaction.atomic():
+                created_assessments = DroughtRiskAssessment.bulk_create_with_levels(to_create, batch_size=500)
+        except Exception as e:
+            logger.error(f"Error saving drought risk assessments: {str(e)}")
+            results["errors"] += len(to_create)
+            for assessment in to_create:
+                record_result({
+                    "region": assessment.region.name,
+                    "status": "error",
+                    "message": str(e)
+                })
+            created_assessments = []
         
-    except Exception as e:
-        logger.error(f"Fatal error in drought risk calculation: {str(e)}")
-        if self.request.retries < self.max_retries:
-            logger.info(f"Retrying task, attempt {self.request.retries + 1}")
-            raise self.retry(countdown=60, exc=e)
-        raise
+        for assessment in created_assessments:
+            logger.info(f"Created assessment for {assessment.region.name}: risk_score={assessment.risk_score:.1f}, risk_level={assessment.risk_level}")
+            
+            results["assessments_created"] += 1
+            record_result({
+                "region": assessment.region.name,
+                "status": "success",
+                "risk_score": assessment.risk_score,
+                "risk_level": assessment.risk_level,
+                "assessment_id": assessment.id
+            })
+    
+    logger.info(f"Drought risk calculation completed: {results}")
+    return results
 
 
 @shared_task(bind=True, max_retries=3)
@@ -206,13 +283,27 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
         today = timezone.now().date()
         yesterday = today - timedelta(days=1)
         
-        # Get recent high-risk assessments
-        high_risk_assessments = DroughtRiskAssessment.objects.filter(
+        # Get recent high-risk assessments with their alert severity and type
+        # worked out by the database, skipping scores too low to alert on
+        high_risk_assessments = list(DroughtRiskAssessment.objects.filter(
             assessment_date__gte=yesterday,
             risk_score__gte=min_risk_threshold
-        ).select_related('region')
+        ).annotate(
+            severity=Case(*[
+                When(risk_score__gte=threshold, then=Value(severity))
+                for threshold, severity, _ in ALERT_SEVERITY_THRESHOLDS
+            ], output_field=CharField()),
+            alert_type=Case(*[
+                When(risk_score__gte=threshold, then=Value(alert_type))
+                for threshold, _, alert_type in ALERT_SEVERITY_THRESHOLDS
+            ], output_field=CharField())
+        ).filter(severity__isnull=False).select_related('region').only(
+            # Only the fields used for alert content
+            'region__name', 'assessment_date', 'risk_score', 'risk_level',
+            'recommended_actions', 'predicted_risk_7_days', 'predicted_risk_30_days'
+        ))
         
-        if not high_risk_assessments.exists():
+        if not high_risk_assessments:
             logger.info("No high-risk assessments found for alert triggering")
             return {"status": "success", "message": "No high-risk regions found", "alerts_triggered": 0}
         
@@ -222,16 +313,36 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
             "alert_results": []
         }
         
+        # Load the active English templates for every severity we may alert on
+        templates = {}
+        for template in AlertTemplate.objects.filter(
+            alert_type__in=['drought_warning', 'water_stress'],
+            severity_level__in=['critical', 'high', 'moderate'],
+            language='en',
+            is_active=True
+        ):
+            templates.setdefault((template.alert_type, template.severity_level), template)
+        
+        # Assessments that already have an alert sent or in progress
+        alerted_assessment_ids = set(Alert.objects.filter(
+            drought_assessment_id__in=[assessment.id for assessment in high_risk_assessments],
+            status__in=['sent', 'sending']
+        ).values_list('drought_assessment_id', flat=True))
+        
+        pending_alerts = []
+        
+        # Template context for each assessment, built once and shared by its alerts
+        alert_contexts = {
+            assessment.id: build_alert_context(assessment)
+            for assessment in high_risk_assessments
+            if assessment.id not in alerted_assessment_ids
+        }
+        
         for assessment in high_risk_assessments:
+            severity, alert_type = assessment.severity, assessment.alert_type
             try:
                 # Check if alert was already sent for this assessment
-                existing_alert = Alert.objects.filter(
-                    region=assessment.region,
-                    drought_assessment=assessment,
-                    status__in=['sent', 'sending']
-                ).exists()
-                
-                if existing_alert:
+                if assessment.id in alerted_assessment_ids:
                     logger.info(f"Alert already exists for {assessment.region.name} assessment {assessment.id}")
                     results["alert_results"].append({
                         "region": assessment.region.name,
@@ -240,37 +351,20 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
                     })
                     continue
                 
-                # Determine alert severity based on risk score
-                if assessment.risk_score >= 80:
-                    severity = 'critical'
-                    alert_type = 'drought_warning'
-                elif assessment.risk_score >= 65:
-                    severity = 'high'
-                    alert_type = 'drought_warning'
-                elif assessment.risk_score >= 50:
-                    severity = 'moderate'
-                    alert_type = 'water_stress'
-                else:
-                    continue  # Skip low-risk assessments
-                
                 # Get or create alert template
-                template = AlertTemplate.objects.filter(
-                    alert_type=alert_type,
-                    severity_level=severity,
-                    language='en',
-                    is_active=True
-                ).first()
+                template = templates.get((alert_type, severity))
                 
                 if not template:
                     # Create a default template
                     template = create_default_alert_template(alert_type, severity)
+                    templates[(alert_type, severity)] = template
                 
                 # Generate alert content
                 alert_title = f"Drought {severity.upper()} Alert - {assessment.region.name}"
-                alert_message = generate_alert_message(assessment, template)
+                alert_message = generate_alert_message(assessment, template, alert_contexts[assessment.id])
                 
-                # Create alert
-                alert = Alert.objects.create(
+                # Queue alert for a single bulk insert
+                pending_alerts.append((severity, Alert(
                     region=assessment.region,
                     template=template,
                     title=alert_title,
@@ -280,21 +374,7 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
                     status='sending',
                     drought_assessment=assessment,
                     created_by_id=1  # System user
-                )
-                
-                # Schedule alert delivery
-                send_alert.delay(alert.id)
-                
-                logger.info(f"Triggered {severity} alert for {assessment.region.name} (risk score: {assessment.risk_score:.1f})")
-                
-                results["alerts_triggered"] += 1
-                results["alert_results"].append({
-                    "region": assessment.region.name,
-                    "status": "success",
-                    "alert_id": alert.alert_id,
-                    "severity": severity,
-                    "risk_score": assessment.risk_score
-                })
+                )))
                 
             except Exception as e:
                 logger.error(f"Error creating alert for {assessment.region.name}: {str(e)}")
@@ -305,6 +385,42 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
                     "message": str(e)
                 })
         
+        # Create alerts (bulk_create skips Alert.save, so assign IDs here)
+        alerts = [alert for _, alert in pending_alerts]
+        for alert, alert_id in zip(alerts, Alert.generate_batch_alert_ids(len(alerts))):
+            alert.alert_id = alert_id
+        
+        try:
+            with transaction.atomic():
+                created_alerts = Alert.objects.bulk_create(alerts)
+        except Exception as e:
+            logger.error(f"Error saving drought alerts: {str(e)}")
+            results["errors"] += len(alerts)
+            for alert in alerts:
+                results["alert_results"].append({
+                    "region": alert.region.name,
+                    "status": "error",
+                    "message": str(e)
+                })
+            created_alerts = []
+        
+        # Schedule alert delivery with a single broker round-trip
+        if created_alerts:
+            group(send_alert.s(alert.id) for alert in created_alerts).apply_async()
+        
+        for (severity, _), alert in zip(pending_alerts, created_alerts):
+            assessment = alert.drought_assessment
+            logger.info(f"Triggered {severity} alert for {assessment.region.name} (risk score: {assessment.risk_score:.1f})")
+            
+            results["alerts_triggered"] += 1
+            results["alert_results"].append({
+                "region": assessment.region.name,
+                "status": "success",
+                "alert_id": alert.alert_id,
+                "severity": severity,
+                "risk_score": assessment.risk_score
+            })
+        
         logger.info(f"Alert triggering completed: {results}")
         return results
         
@@ -316,19 +432,129 @@ def trigger_drought_alerts(self, min_risk_threshold=50.0):
         raise
 
 
-def calculate_weather_drought_score(weather_data):
+def iter_chunks(iterable, size):
+    """
+    Yield successive lists of up to `size` items from an iterable
+    """
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def get_recent_rows(model, region_ids, start_date, end_date, limit):
+    """
+    Queryset of the `limit` most recent rows per region within the date range
+    """
+    ranked = model.objects.filter(
+        region_id__in=region_ids,
+        date__range=[start_date, end_date]
+    ).annotate(
+        row_number=Window(RowNumber(), partition_by=F('region_id'), order_by=F('date').desc())
+    ).filter(row_number__lte=limit).values('pk')
+    
+    return model.objects.filter(pk__in=ranked)
+
+
+def get_recent_values_by_region(model, region_ids, start_date, end_date, limit, field):
+    """
+    Fetch one field of the `limit` most recent rows per region within the date range
+    
+    Returns a dict mapping region_id to a NumPy array of the field values
+    """
+    rows = get_recent_rows(model, region_ids, start_date, end_date, limit).order_by(
+        'region_id'
+    ).values_list('region_id', field)
+    
+    row_region_ids = np.fromiter((region_id for region_id, _ in rows), dtype=np.int64)
+    values = np.fromiter((value for _, value in rows), dtype=np.float64, count=len(row_region_ids))
+    
+    # Rows are grouped by region, so split the values at each new region id
+    unique_ids, starts = np.unique(row_region_ids, return_index=True)
+    return dict(zip(unique_ids.tolist(), np.split(values, starts[1:])))
+
+
+def get_recent_aggregates_by_region(model, region_ids, start_date, end_date, limit, **aggregates):
+    """
+    Aggregate the `limit` most recent rows per region in the database
+    
+    Returns a dict mapping region_id to a dict of the requested aggregates
+    """
+    recent_rows = get_recent_rows(model, region_ids, start_date, end_date, limit)
+    
+    return {
+        row['region_id']: row
+        for row in recent_rows.values('region_id').annotate(**aggregates).order_by()
+    }
+
+
+def get_component_scores(region_ids, start_date, end_date):
+    """
+    Calculate weather, NDVI and soil drought scores for each region
+    
+    Scores are cached per (region, end_date) and only regions missing from the
+    cache are queried. Cached entries are dropped when the underlying data is
+    saved or deleted (see signals.py) and otherwise expire after an hour.
+    
+    Returns a dict mapping source name to {region_id: score}
+    """
+    sources = {
+        'weather': (
+            functools.partial(
+                get_recent_aggregates_by_region, WeatherData, limit=14,
+                avg_temp=Avg('temperature_avg'),
+                total_precipitation=Sum('precipitation_mm'),
+                avg_humidity=Avg('humidity_percent')
+            ),
+            calculate_weather_drought_score
+        ),
+        'ndvi': (
+            functools.partial(get_recent_values_by_region, NDVIData, limit=5, field='ndvi_value'),
+            calculate_ndvi_drought_score
+        ),
+        'soil': (
+            functools.partial(get_recent_values_by_region, SoilMoistureData, limit=7, field='moisture_percent'),
+            calculate_soil_drought_score
+        ),
+    }
+    
+    component_scores = {}
+    for source, (fetch_by_region, score_function) in sources.items():
+        keys = {region_id: component_score_cache_key(source, region_id, end_date) for region_id in region_ids}
+        cached = cache.get_many(list(keys.values()))
+        scores = {region_id: cached[key] for region_id, key in keys.items() if key in cached}
+        
+        missing_ids = [region_id for region_id in region_ids if region_id not in scores]
+        if missing_ids:
+            data_by_region = fetch_by_region(missing_ids, start_date, end_date)
+            fresh_scores = {
+                region_id: score_function(data_by_region.get(region_id))
+                for region_id in missing_ids
+            }
+            cache.set_many(
+                {keys[region_id]: score for region_id, score in fresh_scores.items()},
+                COMPONENT_SCORE_CACHE_TIMEOUT
+            )
+            scores.update(fresh_scores)
+        
+        component_scores[source] = scores
+    
+    return component_scores
+
+
+def calculate_weather_drought_score(weather_stats):
     """
     Calculate drought score based on weather data (0-100, higher = more drought risk)
+    
+    `weather_stats` holds avg_temp, total_precipitation and avg_humidity
+    aggregated over the last 2 weeks
     """
-    if not weather_data.exists():
+    if not weather_stats:
         return None
     
-    recent_data = weather_data[:14]  # Last 2 weeks
-    
     # Calculate metrics
-    avg_temp = recent_data.aggregate(avg_temp=Avg('temperature_avg'))['avg_temp'] or 0
-    total_precipitation = sum(w.precipitation_mm for w in recent_data)
-    avg_humidity = recent_data.aggregate(avg_humidity=Avg('humidity_percent'))['avg_humidity'] or 0
+    avg_temp = weather_stats['avg_temp'] or 0
+    total_precipitation = weather_stats['total_precipitation'] or 0
+    avg_humidity = weather_stats['avg_humidity'] or 0
     
     # Score components (0-100 scale)
     temp_score = min(max((avg_temp - 20) * 2.5, 0), 100)  # Higher temp = higher risk
@@ -344,12 +570,14 @@ def calculate_weather_drought_score(weather_data):
 def calculate_ndvi_drought_score(ndvi_data):
     """
     Calculate drought score based on NDVI data (0-100, higher = more drought risk)
+    
+    `ndvi_data` is an array of NDVI values for the last 5 measurements
     """
-    if not ndvi_data.exists():
+    if ndvi_data is None or not len(ndvi_data):
         return None
     
-    recent_ndvi = ndvi_data[:5]  # Last 5 measurements
-    avg_ndvi = sum(n.ndvi_value for n in recent_ndvi) / len(recent_ndvi)
+    # Last 5 measurements
+    avg_ndvi = float(np.mean(ndvi_data))
     
     # NDVI to drought risk conversion
     # NDVI > 0.6 = healthy (low risk)
@@ -369,12 +597,14 @@ def calculate_ndvi_drought_score(ndvi_data):
 def calculate_soil_drought_score(soil_data):
     """
     Calculate drought score based on soil moisture data (0-100, higher = more drought risk)
+    
+    `soil_data` is an array of soil moisture percentages for the last week
     """
-    if not soil_data.exists():
+    if soil_data is None or not len(soil_data):
         return None
     
-    recent_soil = soil_data[:7]  # Last week
-    avg_moisture = sum(s.moisture_percent for s in recent_soil) / len(recent_soil)
+    # Last week
+    avg_moisture = float(np.mean(soil_data))
     
     # Soil moisture to drought risk conversion
     # >60% = saturated (very low risk)
@@ -438,11 +668,15 @@ def generate_drought_recommendations(risk_score, component_scores, region):
     return "; ".join(recommendations)
 
 
-def generate_alert_message(assessment, template):
+# {name} placeholders in alert templates; any other braces are literal text
+PLACEHOLDER_PATTERN = re.compile(r'\{(\w+)\}')
+
+
+def build_alert_context(assessment):
     """
-    Generate alert message using template and assessment data
+    Build the template context for an assessment's alert messages
     """
-    context = {
+    return {
         'region_name': assessment.region.name,
         'risk_score': assessment.risk_score,
         'risk_level': assessment.get_risk_level_display(),
@@ -451,15 +685,24 @@ def generate_alert_message(assessment, template):
         'predicted_risk_7_days': assessment.predicted_risk_7_days,
         'predicted_risk_30_days': assessment.predicted_risk_30_days
     }
+
+
+def generate_alert_message(assessment, template, context=None):
+    """
+    Generate alert message using template and assessment data
     
-    # Simple template substitution
-    message = template.message_template
-    for key, value in context.items():
-        placeholder = '{' + key + '}'
-        if placeholder in message and value is not None:
-            message = message.replace(placeholder, str(value))
+    Pass a context from build_alert_context to reuse it across templates
+    """
+    if context is None:
+        context = build_alert_context(assessment)
     
-    return message
+    # Substitute all placeholders in a single pass, leaving unknown ones and
+    # those without a value as they are
+    values = {key: str(value) for key, value in context.items() if value is not None}
+    return PLACEHOLDER_PATTERN.sub(
+        lambda match: values.get(match.group(1), match.group(0)),
+        template.message_template
+    )
 
 
 def create_default_alert_template(alert_type, severity_level):
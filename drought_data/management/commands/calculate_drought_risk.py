@@ -49,14 +49,14 @@ class Command(BaseCommand):
         if use_async:
             # Use Celery task
             
-            task = calculate_daily_drought_risk.delay(region_id)
+            task = calculate_daily_drought_risk.delay(region_id, parallel=True)
             self.stdout.write(f"Task queued with ID: {task.id}")
             self.stdout.write("Use 'celery -A drought_warning_system flower' to monitor progress")
         else:
             # Run synchronously
             try:
                 from drought_data.automated_tasks import calculate_daily_drought_risk
-                results = calculate_daily_drought_risk(region_id)
+                results = calculate_daily_drought_risk(region_id, detailed=True)
                 
                 self.stdout.write(self.style.SUCCESS('\n=== DROUGHT RISK CALCULATION RESULTS ==='))
                 self.stdout.write(f"Processed regions: {results['processed_regions']}")
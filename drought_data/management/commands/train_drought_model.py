@@ -1,8 +1,10 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from celery import group
 from drought_data.ml_models import DroughtRiskPredictor, DroughtEarlyWarningSystem
-from drought_data.tasks import fetch_ndvi_data_for_region, fetch_soil_moisture_data_for_region, fetch_weather_data_for_region
+from drought_data.tasks import fetch_all_data_for_region
 from core.models import Region
+import heapq
 import json
 
 
@@ -62,76 +64,81 @@ class Command(BaseCommand):
         """Generate additional sample data for training"""
         self.stdout.write('Generating additional sample data...')
         
-        regions = Region.objects.filter(region_type='county')
-        data_count = 0
-        
-        for region in regions:
-            # Generate data for the last 30 days
-            for days_back in range(30):
-                date = (timezone.now().date() - timezone.timedelta(days=days_back))
-                date_str = date.strftime('%Y-%m-%d')
-                
-                try:
-                    # Fetch NDVI data
-                    fetch_ndvi_data_for_region.delay(region.id, date_str)
-                    
-                    # Fetch soil moisture data
-                    fetch_soil_moisture_data_for_region.delay(region.id, date_str)
-                    
-                    # Fetch weather data
-                    fetch_weather_data_for_region.delay(region.id, date_str)
-                    
-                    data_count += 1
-                    
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.WARNING(f'Warning: Failed to generate data for {region.name} on {date}: {e}')
-                    )
+        region_ids = list(Region.objects.filter(region_type='county').values_list('id', flat=True))
         
+        # Generate data for the last 30 days
+        today = timezone.now().date()
+        date_strs = [
+            (today - timezone.timedelta(days=days_back)).strftime('%Y-%m-%d')
+            for days_back in range(30)
+        ]
+        
+        # Fetch NDVI, soil moisture and weather data with one task per region
+        # and day, publishing all tasks together rather than one .delay() each
+        fetch_signature = fetch_all_data_for_region.s
+        fetch_tasks = [
+            fetch_signature(region_id, date_str)
+            for region_id in region_ids
+            for date_str in date_strs
+        ]
+        
+        try:
+            group(fetch_tasks).apply_async()
+        except Exception as e:
+            self.stdout.write(
+                self.style.WARNING(f'Warning: Failed to submit data generation tasks: {e}')
+            )
+            return
+        
+        data_count = len(fetch_tasks)
         self.stdout.write(f'  ✓ Submitted {data_count} data generation tasks')
     
     def display_training_results(self, results):
         """Display training results in a formatted way"""
-        self.stdout.write('\n' + '='*50)
-        self.stdout.write(self.style.SUCCESS('TRAINING RESULTS'))
-        self.stdout.write('='*50)
+        # Collect the report and write it out in one go
+        lines = []
+        
+        lines.append('\n' + '='*50)
+        lines.append(self.style.SUCCESS('TRAINING RESULTS'))
+        lines.append('='*50)
         
         # Basic info
-        self.stdout.write(f"Training samples: {results['training_samples']}")
-        self.stdout.write(f"Test samples: {results['test_samples']}")
+        lines.append(f"Training samples: {results['training_samples']}")
+        lines.append(f"Test samples: {results['test_samples']}")
         
         # Training metrics
-        self.stdout.write('\nTRAINING METRICS:')
+        lines.append('\nTRAINING METRICS:')
         train_metrics = results['train_metrics']
-        self.stdout.write(f"  RMSE: {train_metrics['rmse']:.3f}")
-        self.stdout.write(f"  MAE:  {train_metrics['mae']:.3f}")
-        self.stdout.write(f"  R²:   {train_metrics['r2']:.3f}")
+        lines.append(f"  RMSE: {train_metrics['rmse']:.3f}")
+        lines.append(f"  MAE:  {train_metrics['mae']:.3f}")
+        lines.append(f"  R²:   {train_metrics['r2']:.3f}")
         
         # Test metrics
-        self.stdout.write('\nTEST METRICS:')
+        lines.append('\nTEST METRICS:')
         test_metrics = results['test_metrics']
-        self.stdout.write(f"  RMSE: {test_metrics['rmse']:.3f}")
-        self.stdout.write(f"  MAE:  {test_metrics['mae']:.3f}")
-        self.stdout.write(f"  R²:   {test_metrics['r2']:.3f}")
+        lines.append(f"  RMSE: {test_metrics['rmse']:.3f}")
+        lines.append(f"  MAE:  {test_metrics['mae']:.3f}")
+        lines.append(f"  R²:   {test_metrics['r2']:.3f}")
         
         # Cross-validation
-        self.stdout.write('\nCROSS-VALIDATION:')
-        self.stdout.write(f"  Mean CV Score: {results['cv_mean_score']:.3f}")
-        self.stdout.write(f"  Std CV Score:  {results['cv_std_score']:.3f}")
+        lines.append('\nCROSS-VALIDATION:')
+        lines.append(f"  Mean CV Score: {results['cv_mean_score']:.3f}")
+        lines.append(f"  Std CV Score:  {results['cv_std_score']:.3f}")
         
         # Feature importance
-        self.stdout.write('\nFEATURE IMPORTANCE:')
-        importance = sorted(
+        lines.append('\nFEATURE IMPORTANCE:')
+        importance = heapq.nlargest(
+            10,  # Top 10 features
             results['feature_importance'].items(),
-            key=lambda x: x[1],
-            reverse=True
+            key=lambda x: x[1]
         )
         
-        for feature, importance_score in importance[:10]:  # Top 10 features
-            self.stdout.write(f"  {feature:<25}: {importance_score:.3f}")
+        add_line = lines.append
+        for feature, importance_score in importance:
+            add_line(f"  {feature:<25}: {importance_score:.3f}")
         
         # Model quality assessment
-        self.stdout.write('\nMODEL QUALITY ASSESSMENT:')
+        lines.append('\nMODEL QUALITY ASSESSMENT:')
         test_r2 = test_metrics['r2']
         if test_r2 > 0.8:
             quality = self.style.SUCCESS("Excellent")
@@ -142,22 +149,24 @@ class Command(BaseCommand):
         else:
             quality = self.style.ERROR("Poor")
         
-        self.stdout.write(f"  Overall Model Quality: {quality}")
+        lines.append(f"  Overall Model Quality: {quality}")
         
         # Recommendations
-        self.stdout.write('\nRECOMMENDATIONS:')
+        lines.append('\nRECOMMENDATIONS:')
         if test_r2 < 0.6:
-            self.stdout.write("  • Consider collecting more training data")
-            self.stdout.write("  • Review feature engineering")
-            self.stdout.write("  • Try different model algorithms")
+            lines.append("  • Consider collecting more training data")
+            lines.append("  • Review feature engineering")
+            lines.append("  • Try different model algorithms")
         elif test_metrics['rmse'] > 20:
-            self.stdout.write("  • Model predictions may have high variance")
-            self.stdout.write("  • Consider regularization or ensemble methods")
+            lines.append("  • Model predictions may have high variance")
+            lines.append("  • Consider regularization or ensemble methods")
         else:
-            self.stdout.write("  • Model performance is acceptable")
-            self.stdout.write("  • Ready for production use")
+            lines.append("  • Model performance is acceptable")
+            lines.append("  • Ready for production use")
         
-        self.stdout.write('='*50 + '\n')
+        lines.append('='*50 + '\n')
+        
+        self.stdout.write('\n'.join(lines))
     
     def create_sample_assessments(self):
         """Create sample drought risk assessments using the trained model"""
@@ -166,26 +175,27 @@ class Command(BaseCommand):
         # Initialize early warning system
         ews = DroughtEarlyWarningSystem()
         
-        # Get all county regions
-        regions = Region.objects.filter(region_type='county')
-        
-        assessments_created = 0
-        for region in regions:
-            try:
-                # Create assessment for today
-                assessment = ews.assess_drought_risk(region)
-                
-                self.stdout.write(
-                    f"  ✓ {region.name}: {assessment.risk_level.upper()} risk "
-                    f"(score: {assessment.risk_score})"
-                )
-                assessments_created += 1
-                
-            except Exception as e:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"  ⚠ Failed to create assessment for {region.name}: {e}"
-                    )
-                )
-        
-        self.stdout.write(f'  ✓ Created {assessments_created} drought risk assessments')
\ No newline at end of file
+        # Get all county regions (assessments only need their id and name)
+        regions = Region.objects.filter(region_type='county').only('id', 'name')
+        
+        # Predict every region with one model call, then save them together
+        try:
+            assessments, errors = ews.assess_drought_risk_batch(regions)
+        except Exception as e:
+            self.stdout.write(
+                self.style.WARNING(f"  ⚠ Failed to save drought risk assessments: {e}")
+            )
+            return
+        
+        warning = self.style.WARNING
+        lines = [
+            warning(f"  ⚠ Failed to create assessment for {region_name}: {error}")
+            for region_name, error in errors.items()
+        ]
+        lines.extend(
+            f"  ✓ {assessment.region.name}: {assessment.risk_level.upper()} risk "
+            f"(score: {assessment.risk_score})"
+            for assessment in assessments
+        )
+        lines.append(f'  ✓ Created {len(assessments)} drought risk assessments')
+        self.stdout.write('\n'.join(lines))
\ No newline at end of file
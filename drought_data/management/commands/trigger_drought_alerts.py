@@ -1,6 +1,10 @@
+import numpy as np
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
+# Alert severity for risk scores below 65, from 65 and from 80
+DRY_RUN_SEVERITY_THRESHOLDS = [65, 80]
+DRY_RUN_SEVERITIES = np.array(['MODERATE', 'HIGH', 'CRITICAL'])
 
 
 class Command(BaseCommand):
@@ -51,29 +55,43 @@ class Command(BaseCommand):
                     today = timezone.now().date()
                     yesterday = today - timedelta(days=1)
                     
-                    high_risk_assessments = DroughtRiskAssessment.objects.filter(
+                    # Evaluate once, fetching only the displayed fields
+                    high_risk_assessments = list(DroughtRiskAssessment.objects.filter(
                         assessment_date__gte=yesterday,
                         risk_score__gte=threshold
-                    ).select_related('region')
+                    ).values('region__name', 'risk_score', 'risk_level', 'assessment_date'))
                     
                     self.stdout.write(f"\n=== DRY RUN RESULTS ===")
-                    self.stdout.write(f"Found {high_risk_assessments.count()} high-risk assessments")
+                    self.stdout.write(f"Found {len(high_risk_assessments)} high-risk assessments")
                     
-                    for assessment in high_risk_assessments:
-                        if assessment.risk_score >= 80:
-                            severity = 'CRITICAL'
-                        elif assessment.risk_score >= 65:
-                            severity = 'HIGH'
-                        else:
-                            severity = 'MODERATE'
-                        
-                        self.stdout.write(f"\nRegion: {assessment.region.name}")
-                        self.stdout.write(f"Risk Score: {assessment.risk_score:.1f}")
-                        self.stdout.write(f"Risk Level: {assessment.risk_level}")
-                        self.stdout.write(f"Alert Severity: {severity}")
-                        self.stdout.write(f"Assessment Date: {assessment.assessment_date}")
+                    # Classify alert severity for all assessments at once
+                    risk_scores = np.fromiter(
+                        (assessment['risk_score'] for assessment in high_risk_assessments),
+                        dtype=np.float64, count=len(high_risk_assessments)
+                    )
+                    severity_indexes = np.digitize(risk_scores, DRY_RUN_SEVERITY_THRESHOLDS)
+                    severities = DRY_RUN_SEVERITIES[severity_indexes]
+                    
+                    # Collect the report and write it out in one go
+                    lines = []
+                    add_line = lines.append
+                    for assessment, severity in zip(high_risk_assessments, severities):
+                        add_line(f"\nRegion: {assessment['region__name']}")
+                        add_line(f"Risk Score: {assessment['risk_score']:.1f}")
+                        add_line(f"Risk Level: {assessment['risk_level']}")
+                        add_line(f"Alert Severity: {severity}")
+                        add_line(f"Assessment Date: {assessment['assessment_date']}")
+                    
+                    if lines:
+                        # Summarise how many alerts of each severity would be sent
+                        severity_counts = np.bincount(severity_indexes, minlength=len(DRY_RUN_SEVERITIES))
+                        add_line("\nAlerts by severity: " + ", ".join(
+                            f"{severity} {count}"
+                            for severity, count in zip(DRY_RUN_SEVERITIES[::-1], severity_counts[::-1])
+                        ))
+                        self.stdout.write('\n'.join(lines))
                     
-                    if high_risk_assessments.count() == 0:
+                    if not high_risk_assessments:
                         self.stdout.write("No alerts would be triggered.")
                 else:
                     from drought_data.automated_tasks import trigger_drought_alerts
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        ("drought_data", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="droughtriskassessment",
+            index=models.Index(
+                fields=["assessment_date", "risk_score"],
+                name="drought_dat_assessm_3000b9_idx",
+            ),
+        ),
+    ]
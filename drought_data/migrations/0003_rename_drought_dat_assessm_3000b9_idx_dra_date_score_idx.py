@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("drought_data", "0002_droughtriskassessment_drought_dat_assessm_3000b9_idx"),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name="droughtriskassessment",
+            new_name="dra_date_score_idx",
+            old_name="drought_dat_assessm_3000b9_idx",
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:43
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so the tables stay writable
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        (
+            "drought_data",
+            "0003_rename_drought_dat_assessm_3000b9_idx_dra_date_score_idx",
+        ),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="ndvidata",
+            index=models.Index(fields=["-date"], name="ndvi_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="soilmoisturedata",
+            index=models.Index(fields=["-date"], name="soil_date_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="weatherdata",
+            index=models.Index(fields=["-date"], name="weather_date_idx"),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:49
+
+import django.core.validators
+import drought_data.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("drought_data", "0004_ndvidata_ndvi_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="droughtriskassessment",
+            name="confidence_score",
+            field=drought_data.models.RealField(
+                help_text="Model confidence (0-1)",
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(1),
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ndvidata",
+            name="cloud_cover_percent",
+            field=drought_data.models.RealField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(100),
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ndvidata",
+            name="ndvi_value",
+            field=drought_data.models.RealField(
+                help_text="NDVI value (-1 to 1, higher values indicate healthier vegetation)",
+                validators=[
+                    django.core.validators.MinValueValidator(-1.0),
+                    django.core.validators.MaxValueValidator(1.0),
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="soilmoisturedata",
+            name="moisture_percent",
+            field=drought_data.models.RealField(
+                help_text="Soil moisture percentage (0-100%)",
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(100),
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="weatherdata",
+            name="humidity_percent",
+            field=drought_data.models.RealField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(100),
+                ],
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        ("drought_data", "0005_alter_droughtriskassessment_confidence_score_and_more"),
+    ]
+
+    operations = [
+        # One row per region and day; each reading is averaged over its
+        # sources first so (region_id, date) stays unique, which
+        # REFRESH MATERIALIZED VIEW CONCURRENTLY requires
+        migrations.RunSQL(
+            sql="""
+                CREATE MATERIALIZED VIEW drought_timeseries_mv AS
+                SELECT region_id, date, risk_score, ndvi_value, soil_moisture,
+                       precipitation, temperature_avg
+                FROM (
+                    SELECT region_id, assessment_date AS date, risk_score
+                    FROM drought_data_droughtriskassessment
+                ) AS risk
+                FULL OUTER JOIN (
+                    SELECT region_id, date, AVG(ndvi_value) AS ndvi_value
+                    FROM drought_data_ndvidata
+                    GROUP BY region_id, date
+                ) AS ndvi USING (region_id, date)
+                FULL OUTER JOIN (
+                    SELECT region_id, date, AVG(moisture_percent) AS soil_moisture
+                    FROM drought_data_soilmoisturedata
+                    GROUP BY region_id, date
+                ) AS soil USING (region_id, date)
+                FULL OUTER JOIN (
+                    SELECT region_id, date,
+                           AVG(precipitation_mm) AS precipitation,
+                           AVG(temperature_avg) AS temperature_avg
+                    FROM drought_data_weatherdata
+                    GROUP BY region_id, date
+                ) AS weather USING (region_id, date);
+                CREATE UNIQUE INDEX drought_timeseries_mv_region_date_idx
+                    ON drought_timeseries_mv (region_id, date DESC);
+            """,
+            reverse_sql="DROP MATERIALIZED VIEW drought_timeseries_mv;",
+        ),
+        migrations.CreateModel(
+            name="DroughtTimeSeriesRow",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "region",
+                        "date",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "region",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="core.region",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("risk_score", models.FloatField(null=True)),
+                ("ndvi_value", models.FloatField(null=True)),
+                ("soil_moisture", models.FloatField(null=True)),
+                ("precipitation", models.FloatField(null=True)),
+                ("temperature_avg", models.FloatField(null=True)),
+            ],
+            options={
+                "db_table": "drought_timeseries_mv",
+                "ordering": ["region", "date"],
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-16 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("drought_data", "0006_droughttimeseriesrow"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ndvidata",
+            name="vegetation_health_status",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(ndvi_value__gte=0.6, then=models.Value("Healthy")),
+                    models.When(ndvi_value__gte=0.4, then=models.Value("Moderate")),
+                    models.When(ndvi_value__gte=0.2, then=models.Value("Stressed")),
+                    default=models.Value("Severely Stressed"),
+                ),
+                output_field=models.CharField(max_length=20),
+            ),
+        ),
+        migrations.AddField(
+            model_name="soilmoisturedata",
+            name="moisture_status",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        moisture_percent__gte=60, then=models.Value("Saturated")
+                    ),
+                    models.When(
+                        moisture_percent__gte=40, then=models.Value("Adequate")
+                    ),
+                    models.When(moisture_percent__gte=20, then=models.Value("Low")),
+                    default=models.Value("Very Low"),
+                ),
+                output_field=models.CharField(max_length=20),
+            ),
+        ),
+    ]
@@ -0,0 +1,143 @@
+# Generated by Django 5.2.7 on 2026-10-16 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        ("drought_data", "0007_ndvidata_vegetation_health_status_and_more"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("risk_score__gte", 0), ("risk_score__lte", 100)),
+                name="dra_risk_score_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("ndvi_component_score__gte", 0), ("ndvi_component_score__lte", 100)
+                ),
+                name="dra_ndvi_component_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("soil_moisture_component_score__gte", 0),
+                    ("soil_moisture_component_score__lte", 100),
+                ),
+                name="dra_soil_component_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("weather_component_score__gte", 0),
+                    ("weather_component_score__lte", 100),
+                ),
+                name="dra_weather_component_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("predicted_risk_7_days__gte", 0),
+                    ("predicted_risk_7_days__lte", 100),
+                ),
+                name="dra_predicted_7_days_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("predicted_risk_30_days__gte", 0),
+                    ("predicted_risk_30_days__lte", 100),
+                ),
+                name="dra_predicted_30_days_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="droughtriskassessment",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("confidence_score__gte", 0), ("confidence_score__lte", 1)
+                ),
+                name="dra_confidence_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ndvidata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("ndvi_value__gte", -1), ("ndvi_value__lte", 1)),
+                name="ndvi_value_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ndvidata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("cloud_cover_percent__gte", 0), ("cloud_cover_percent__lte", 100)
+                ),
+                name="ndvi_cloud_cover_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="soilmoisturedata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("moisture_percent__gte", 0), ("moisture_percent__lte", 100)
+                ),
+                name="soil_moisture_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="soilmoisturedata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("soil_depth_cm__gte", 1), ("soil_depth_cm__lte", 200)
+                ),
+                name="soil_depth_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="weatherdata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("precipitation_mm__gte", 0)),
+                name="weather_precipitation_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="weatherdata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("humidity_percent__gte", 0), ("humidity_percent__lte", 100)
+                ),
+                name="weather_humidity_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="weatherdata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("wind_speed_kmh__gte", 0)),
+                name="weather_wind_speed_range",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="weatherdata",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("evapotranspiration_mm__gte", 0)),
+                name="weather_evapotranspiration_range",
+            ),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-16 15:12
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_data_availability(apps, schema_editor):
+    # Fill the rollup for existing regions so the endpoint isn't empty until
+    # the first scheduled refresh. A fresh database has no regions, so the
+    # current model is only used against the schema this migration creates.
+    if not apps.get_model("core", "Region").objects.exists():
+        return
+    from drought_data.models import RegionDataAvailability
+
+    RegionDataAvailability.refresh()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_userprofile_latitude_userprofile_longitude"),
+        ("drought_data", "0008_droughtriskassessment_dra_risk_score_range_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegionDataAvailability",
+            fields=[
+                (
+                    "region",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="data_availability",
+                        serialize=False,
+                        to="core.region",
+                    ),
+                ),
+                ("has_ndvi_data", models.BooleanField(default=False)),
+                ("has_soil_moisture_data", models.BooleanField(default=False)),
+                ("has_weather_data", models.BooleanField(default=False)),
+                ("has_risk_assessment", models.BooleanField(default=False)),
+                ("latest_ndvi_date", models.DateField(blank=True, null=True)),
+                ("latest_soil_moisture_date", models.DateField(blank=True, null=True)),
+                ("latest_weather_date", models.DateField(blank=True, null=True)),
+                ("latest_assessment_date", models.DateField(blank=True, null=True)),
+                (
+                    "ndvi_data_quality",
+                    models.CharField(blank=True, max_length=20, null=True),
+                ),
+                (
+                    "overall_data_completeness",
+                    models.FloatField(
+                        default=0.0,
+                        validators=[
+                            django.core.validators.MinValueValidator(0.0),
+                            django.core.validators.MaxValueValidator(1.0),
+                        ],
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Region data availability",
+                "ordering": ["region__region_type", "region__name"],
+            },
+        ),
+        migrations.RunPython(populate_data_availability, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,89 @@
-from django.db import models
+from bisect import bisect_right
+
+from django.db import connection, models, transaction
+from django.db.models import Case, Max, OuterRef, Prefetch, Q, Subquery, Value, When
 from django.core.validators import MinValueValidator, MaxValueValidator
 from core.models import Region
 
 
+def range_constraint(name, field, min_value=None, max_value=None):
+    """
+    CHECK constraint matching a field's Min/MaxValueValidator bounds, so
+    bulk writes that skip model validation are held to the same range
+    """
+    condition = Q()
+    if min_value is not None:
+        condition &= Q(**{f'{field}__gte': min_value})
+    if max_value is not None:
+        condition &= Q(**{f'{field}__lte': max_value})
+    return models.CheckConstraint(condition=condition, name=name)
+
+
+class RealField(models.FloatField):
+    """
+    FloatField stored as 4-byte single precision on PostgreSQL, for
+    bounded readings that don't need double precision
+    """
+    def db_type(self, connection):
+        if connection.vendor == 'postgresql':
+            return 'real'
+        return super().db_type(connection)
+
+
+class RegionDataManager(models.Manager):
+    """
+    Manager for per-region data that loads each row's region with it
+    """
+    def get_queryset(self):
+        return super().get_queryset().select_related('region')
+    
+    def recent_prefetch(self, to_attr, limit=1):
+        """
+        Prefetch for Region querysets that puts each region's latest
+        `limit` rows, newest first, in a list on `to_attr`
+        """
+        meta = self.model._meta
+        related_name = meta.get_field('region').remote_field.related_name
+        latest_first = meta.ordering[0]
+        queryset = self.get_queryset().select_related(None).order_by(latest_first)[:limit]
+        return Prefetch(related_name, queryset=queryset, to_attr=to_attr)
+    
+    def upsert_many(self, records, batch_size=5000):
+        """
+        Insert records, updating rows that already exist for the same
+        unique_together key, in one INSERT ... ON CONFLICT per batch.
+        The regions' availability rollups are refreshed, and their cached
+        component scores dropped, once it commits.
+        """
+        from .signals import invalidate_bulk_component_scores
+        
+        meta = self.model._meta
+        unique_fields = list(meta.unique_together[0])
+        update_fields = [
+            field.name for field in meta.concrete_fields
+            if not field.primary_key and not field.generated
+            and field.name not in unique_fields and field.name != 'created_at'
+        ]
+        region_ids = {record.region_id for record in records}
+        
+        def data_changed():
+            RegionDataAvailability.refresh(region_ids)
+            invalidate_bulk_component_scores(self.model, records)
+        
+        # The hook runs when this block (or the caller's transaction) commits,
+        # so the rollup always sees the new rows
+        with transaction.atomic(using=self.db):
+            upserted = self.bulk_create(
+                records,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+            )
+            transaction.on_commit(data_changed, using=self.db)
+        return upserted
+
+
 class NDVIData(models.Model):
     """
     Normalized Difference Vegetation Index data from satellite imagery
@@ -11,14 +92,14 @@ class NDVIData(models.Model):
     date = models.DateField()
     
     # NDVI values typically range from -1 to 1
-    ndvi_value = models.FloatField(
+    ndvi_value = RealField(
         validators=[MinValueValidator(-1.0), MaxValueValidator(1.0)],
         help_text="NDVI value (-1 to 1, higher values indicate healthier vegetation)"
     )
     
     # Data source information
     satellite_source = models.CharField(max_length=50, default='Landsat-8')
-    cloud_cover_percent = models.FloatField(
+    cloud_cover_percent = RealField(
         null=True, blank=True,
         validators=[MinValueValidator(0), MaxValueValidator(100)]
     )
@@ -35,26 +116,44 @@ class NDVIData(models.Model):
         default='good'
     )
     
+    # Vegetation health category, computed by the database from ndvi_value
+    vegetation_health_status = models.GeneratedField(
+        expression=Case(
+            When(ndvi_value__gte=0.6, then=Value('Healthy')),
+            When(ndvi_value__gte=0.4, then=Value('Moderate')),
+            When(ndvi_value__gte=0.2, then=Value('Stressed')),
+            default=Value('Severely Stressed'),
+        ),
+        output_field=models.CharField(max_length=20),
+        db_persist=True,
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = RegionDataManager()
+    
     class Meta:
         ordering = ['-date', 'region']
         unique_together = ['region', 'date', 'satellite_source']
+        indexes = [
+            # unique_together already indexes (region, date); this serves
+            # recent readings across all regions
+            models.Index(fields=['-date'], name='ndvi_date_idx'),
+        ]
+        constraints = [
+            range_constraint('ndvi_value_range', 'ndvi_value', -1, 1),
+            range_constraint('ndvi_cloud_cover_range', 'cloud_cover_percent', 0, 100),
+        ]
     
     def __str__(self):
         return f"NDVI {self.ndvi_value:.3f} - {self.region.name} ({self.date})"
     
-    @property
-    def vegetation_health_status(self):
-        """Categorize vegetation health based on NDVI value"""
-        if self.ndvi_value >= 0.6:
-            return "Healthy"
-        elif self.ndvi_value >= 0.4:
-            return "Moderate"
-        elif self.ndvi_value >= 0.2:
-            return "Stressed"
-        else:
-            return "Severely Stressed"
+    def save(self, *args, **kwargs):
+        """Reload vegetation_health_status after an update, which doesn't return it"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.refresh_from_db(fields=['vegetation_health_status'])
 
 
 class SoilMoistureData(models.Model):
@@ -65,7 +164,7 @@ class SoilMoistureData(models.Model):
     date = models.DateField()
     
     # Soil moisture as percentage (0-100%)
-    moisture_percent = models.FloatField(
+    moisture_percent = RealField(
         validators=[MinValueValidator(0), MaxValueValidator(100)],
         help_text="Soil moisture percentage (0-100%)"
     )
@@ -90,26 +189,44 @@ class SoilMoistureData(models.Model):
     
     temperature_celsius = models.FloatField(null=True, blank=True)
     
+    # Moisture category, computed by the database from moisture_percent
+    moisture_status = models.GeneratedField(
+        expression=Case(
+            When(moisture_percent__gte=60, then=Value('Saturated')),
+            When(moisture_percent__gte=40, then=Value('Adequate')),
+            When(moisture_percent__gte=20, then=Value('Low')),
+            default=Value('Very Low'),
+        ),
+        output_field=models.CharField(max_length=20),
+        db_persist=True,
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = RegionDataManager()
+    
     class Meta:
         ordering = ['-date', 'region']
         unique_together = ['region', 'date', 'soil_depth_cm', 'data_source']
+        indexes = [
+            # unique_together already indexes (region, date); this serves
+            # recent readings across all regions
+            models.Index(fields=['-date'], name='soil_date_idx'),
+        ]
+        constraints = [
+            range_constraint('soil_moisture_range', 'moisture_percent', 0, 100),
+            range_constraint('soil_depth_range', 'soil_depth_cm', 1, 200),
+        ]
     
     def __str__(self):
         return f"Soil Moisture {self.moisture_percent:.1f}% - {self.region.name} ({self.date})"
     
-    @property
-    def moisture_status(self):
-        """Categorize soil moisture status"""
-        if self.moisture_percent >= 60:
-            return "Saturated"
-        elif self.moisture_percent >= 40:
-            return "Adequate"
-        elif self.moisture_percent >= 20:
-            return "Low"
-        else:
-            return "Very Low"
+    def save(self, *args, **kwargs):
+        """Reload moisture_status after an update, which doesn't return it"""
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            self.refresh_from_db(fields=['moisture_status'])
 
 
 class WeatherData(models.Model):
@@ -132,7 +249,7 @@ class WeatherData(models.Model):
     )
     
     # Humidity percentage
-    humidity_percent = models.FloatField(
+    humidity_percent = RealField(
         null=True, blank=True,
         validators=[MinValueValidator(0), MaxValueValidator(100)]
     )
@@ -154,9 +271,22 @@ class WeatherData(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = RegionDataManager()
+    
     class Meta:
         ordering = ['-date', 'region']
         unique_together = ['region', 'date', 'data_source']
+        indexes = [
+            # unique_together already indexes (region, date); this serves
+            # recent readings across all regions
+            models.Index(fields=['-date'], name='weather_date_idx'),
+        ]
+        constraints = [
+            range_constraint('weather_precipitation_range', 'precipitation_mm', 0),
+            range_constraint('weather_humidity_range', 'humidity_percent', 0, 100),
+            range_constraint('weather_wind_speed_range', 'wind_speed_kmh', 0),
+            range_constraint('weather_evapotranspiration_range', 'evapotranspiration_mm', 0),
+        ]
     
     def __str__(self):
         return f"Weather - {self.region.name} ({self.date})"
@@ -174,6 +304,16 @@ class DroughtRiskAssessment(models.Model):
         ('very_high', 'Very High'),
         ('extreme', 'Extreme'),
     ]
+    RISK_LEVEL_LABELS = dict(RISK_LEVELS)
+    
+    # Lowest risk score of each risk level above very_low, in ascending order
+    RISK_LEVEL_THRESHOLDS = [
+        (20, 'low'),
+        (35, 'moderate'),
+        (50, 'high'),
+        (65, 'very_high'),
+        (80, 'extreme'),
+    ]
     
     region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='drought_assessments')
     assessment_date = models.DateField()
@@ -211,7 +351,7 @@ class DroughtRiskAssessment(models.Model):
     
     # Analysis metadata
     model_version = models.CharField(max_length=20, default='1.0')
-    confidence_score = models.FloatField(
+    confidence_score = RealField(
         validators=[MinValueValidator(0), MaxValueValidator(1)],
         help_text="Model confidence (0-1)"
     )
@@ -221,26 +361,185 @@ class DroughtRiskAssessment(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     
+    objects = RegionDataManager()
+    
     class Meta:
         ordering = ['-assessment_date', 'region']
         unique_together = ['region', 'assessment_date']
+        indexes = [
+            # unique_together already indexes (region, assessment_date)
+            models.Index(fields=['assessment_date', 'risk_score'], name='dra_date_score_idx'),
+        ]
+        constraints = [
+            range_constraint('dra_risk_score_range', 'risk_score', 0, 100),
+            range_constraint('dra_ndvi_component_range', 'ndvi_component_score', 0, 100),
+            range_constraint('dra_soil_component_range', 'soil_moisture_component_score', 0, 100),
+            range_constraint('dra_weather_component_range', 'weather_component_score', 0, 100),
+            range_constraint('dra_predicted_7_days_range', 'predicted_risk_7_days', 0, 100),
+            range_constraint('dra_predicted_30_days_range', 'predicted_risk_30_days', 0, 100),
+            range_constraint('dra_confidence_range', 'confidence_score', 0, 1),
+        ]
     
     def __str__(self):
         return f"Drought Risk {self.get_risk_level_display()} ({self.risk_score:.1f}) - {self.region.name}"
     
+    def get_risk_level_display(self):
+        """Label for risk_level, without rebuilding the choices dict per call"""
+        return self.RISK_LEVEL_LABELS.get(self.risk_level, self.risk_level)
+    
+    @classmethod
+    def risk_level_for_score(cls, risk_score):
+        """Map a risk score to its risk level"""
+        index = bisect_right(cls.RISK_LEVEL_THRESHOLDS, risk_score, key=lambda threshold: threshold[0])
+        return cls.RISK_LEVEL_THRESHOLDS[index - 1][1] if index else 'very_low'
+    
+    @classmethod
+    def risk_level_expression(cls):
+        """Database expression mapping risk_score to its risk level"""
+        return Case(
+            *[
+                When(risk_score__gte=threshold, then=Value(level))
+                for threshold, level in reversed(cls.RISK_LEVEL_THRESHOLDS)
+            ],
+            default=Value('very_low'),
+            output_field=models.CharField(),
+        )
+    
+    @classmethod
+    def bulk_create_with_levels(cls, assessments, **kwargs):
+        """bulk_create assessments, assigning risk levels as save() does"""
+        for assessment in assessments:
+            assessment.risk_level = cls.risk_level_for_score(assessment.risk_score)
+        return cls.objects.bulk_create(assessments, **kwargs)
+    
+    @classmethod
+    def update_risk_levels(cls, queryset=None):
+        """Recompute risk levels from risk scores in a single UPDATE"""
+        if queryset is None:
+            queryset = cls.objects.all()
+        return queryset.update(risk_level=cls.risk_level_expression())
+    
     def save(self, *args, **kwargs):
         """Auto-assign risk level based on score"""
-        if self.risk_score >= 80:
-            self.risk_level = 'extreme'
-        elif self.risk_score >= 65:
-            self.risk_level = 'very_high'
-        elif self.risk_score >= 50:
-            self.risk_level = 'high'
-        elif self.risk_score >= 35:
-            self.risk_level = 'moderate'
-        elif self.risk_score >= 20:
-            self.risk_level = 'low'
-        else:
-            self.risk_level = 'very_low'
+        self.risk_level = self.risk_level_for_score(self.risk_score)
+        
+        super().save(*args, **kwargs)
+
+
+class DroughtTimeSeriesRow(models.Model):
+    """
+    Daily risk score and readings per region, read from the
+    drought_timeseries_mv materialized view
+    """
+    pk = models.CompositePrimaryKey('region', 'date')
+    region = models.ForeignKey(
+        Region, on_delete=models.DO_NOTHING, related_name='+', db_constraint=False
+    )
+    date = models.DateField()
+    risk_score = models.FloatField(null=True)
+    ndvi_value = models.FloatField(null=True)
+    soil_moisture = models.FloatField(null=True)
+    precipitation = models.FloatField(null=True)
+    temperature_avg = models.FloatField(null=True)
+    
+    class Meta:
+        managed = False
+        db_table = 'drought_timeseries_mv'
+        ordering = ['region', 'date']
+    
+    def __str__(self):
+        return f"Time series - {self.region_id} ({self.date})"
+    
+    @classmethod
+    def refresh(cls):
+        """Rebuild the view from the current assessments and readings"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {cls._meta.db_table}')
+
+
+class RegionDataAvailability(models.Model):
+    """
+    Per-region rollup of which data sources have readings and how recent
+    they are, kept up to date by refresh() instead of aggregating the four
+    data tables on every request
+    """
+    region = models.OneToOneField(
+        Region, on_delete=models.CASCADE, primary_key=True, related_name='data_availability'
+    )
+    
+    has_ndvi_data = models.BooleanField(default=False)
+    has_soil_moisture_data = models.BooleanField(default=False)
+    has_weather_data = models.BooleanField(default=False)
+    has_risk_assessment = models.BooleanField(default=False)
+    
+    latest_ndvi_date = models.DateField(null=True, blank=True)
+    latest_soil_moisture_date = models.DateField(null=True, blank=True)
+    latest_weather_date = models.DateField(null=True, blank=True)
+    latest_assessment_date = models.DateField(null=True, blank=True)
+    
+    ndvi_data_quality = models.CharField(max_length=20, null=True, blank=True)
+    overall_data_completeness = models.FloatField(
+        default=0.0,
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)]
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    # Rollup date field -> (data model, date field aggregated)
+    SOURCES = {
+        'latest_ndvi_date': (NDVIData, 'date'),
+        'latest_soil_moisture_date': (SoilMoistureData, 'date'),
+        'latest_weather_date': (WeatherData, 'date'),
+        'latest_assessment_date': (DroughtRiskAssessment, 'assessment_date'),
+    }
+    
+    class Meta:
+        ordering = ['region__region_type', 'region__name']
+        verbose_name_plural = "Region data availability"
+    
+    def __str__(self):
+        return f"Data availability - {self.region_id}"
+    
+    @classmethod
+    def refresh(cls, region_ids=None):
+        """
+        Recompute the rollup for the given regions, or all regions, with
+        one aggregate SELECT and one INSERT ... ON CONFLICT
+        """
+        regions = Region.objects.order_by()
+        if region_ids is not None:
+            regions = regions.filter(pk__in=region_ids)
+        
+        latest_dates = {}
+        for name, (data_model, date_field) in cls.SOURCES.items():
+            latest_dates[name] = Subquery(
+                data_model._base_manager
+                .filter(region=OuterRef('pk'))
+                .order_by()
+                .values('region')
+                .annotate(latest=Max(date_field))
+                .values('latest')
+            )
+        
+        rows = []
+        for region_id, *dates in regions.annotate(**latest_dates).values_list('pk', *latest_dates):
+            row = cls(region_id=region_id, **dict(zip(latest_dates, dates)))
+            row.has_ndvi_data = row.latest_ndvi_date is not None
+            row.has_soil_moisture_data = row.latest_soil_moisture_date is not None
+            row.has_weather_data = row.latest_weather_date is not None
+            row.has_risk_assessment = row.latest_assessment_date is not None
+            row.ndvi_data_quality = 'good' if row.has_ndvi_data else None
+            row.overall_data_completeness = sum([
+                row.has_ndvi_data, row.has_soil_moisture_data,
+                row.has_weather_data, row.has_risk_assessment,
+            ]) / 4.0
+            rows.append(row)
         
-        super().save(*args, **kwargs)
\ No newline at end of file
+        return cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['region'],
+            update_fields=[
+                field.name for field in cls._meta.concrete_fields if not field.primary_key
+            ],
+        )
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from core.serializers import RegionSummarySerializer
-from .models import NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment
+from .models import (
+    NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment, DroughtTimeSeriesRow,
+    RegionDataAvailability
+)
 
 
 class NDVIDataSerializer(serializers.ModelSerializer):
@@ -67,6 +70,75 @@ class DroughtRiskAssessmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'risk_level']
 
 
+class RegionLookupMixin:
+    """
+    Embeds the region of a .values() row from the pre-serialized regions
+    passed in the serializer context
+    """
+    def get_region(self, obj):
+        return self.context['regions'][obj['region_id']]
+
+
+class NDVIDataLiteSerializer(RegionLookupMixin, serializers.Serializer):
+    """Read-only NDVI serializer for .values() rows in list responses"""
+    id = serializers.IntegerField()
+    region = serializers.SerializerMethodField()
+    date = serializers.DateField()
+    ndvi_value = serializers.FloatField()
+    satellite_source = serializers.CharField()
+    cloud_cover_percent = serializers.FloatField(allow_null=True)
+    data_quality = serializers.CharField()
+    vegetation_health_status = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class SoilMoistureDataLiteSerializer(RegionLookupMixin, serializers.Serializer):
+    """Read-only soil moisture serializer for .values() rows in list responses"""
+    id = serializers.IntegerField()
+    region = serializers.SerializerMethodField()
+    date = serializers.DateField()
+    moisture_percent = serializers.FloatField()
+    soil_depth_cm = serializers.IntegerField()
+    data_source = serializers.CharField()
+    temperature_celsius = serializers.FloatField(allow_null=True)
+    moisture_status = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class WeatherDataLiteSerializer(RegionLookupMixin, serializers.Serializer):
+    """Read-only weather serializer for .values() rows in list responses"""
+    id = serializers.IntegerField()
+    region = serializers.SerializerMethodField()
+    date = serializers.DateField()
+    temperature_max = serializers.FloatField(allow_null=True)
+    temperature_min = serializers.FloatField(allow_null=True)
+    temperature_avg = serializers.FloatField(allow_null=True)
+    precipitation_mm = serializers.FloatField()
+    humidity_percent = serializers.FloatField(allow_null=True)
+    wind_speed_kmh = serializers.FloatField(allow_null=True)
+    evapotranspiration_mm = serializers.FloatField(allow_null=True)
+    data_source = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
+class DroughtRiskAssessmentLiteSerializer(RegionLookupMixin, serializers.Serializer):
+    """Read-only assessment serializer for .values() rows in list responses"""
+    id = serializers.IntegerField()
+    region = serializers.SerializerMethodField()
+    assessment_date = serializers.DateField()
+    risk_score = serializers.FloatField()
+    risk_level = serializers.CharField()
+    ndvi_component_score = serializers.FloatField()
+    soil_moisture_component_score = serializers.FloatField()
+    weather_component_score = serializers.FloatField()
+    predicted_risk_7_days = serializers.FloatField(allow_null=True)
+    predicted_risk_30_days = serializers.FloatField(allow_null=True)
+    model_version = serializers.CharField()
+    confidence_score = serializers.FloatField()
+    recommended_actions = serializers.CharField()
+    created_at = serializers.DateTimeField()
+
+
 class RegionalDroughtSummarySerializer(serializers.Serializer):
     """Serializer for regional drought summary data"""
     region_id = serializers.IntegerField()
@@ -88,14 +160,15 @@ class RegionalDroughtSummarySerializer(serializers.Serializer):
     active_alerts_count = serializers.IntegerField()
 
 
-class DroughtTimeSeriesSerializer(serializers.Serializer):
+class DroughtTimeSeriesSerializer(serializers.ModelSerializer):
     """Serializer for time series drought data"""
-    date = serializers.DateField()
-    risk_score = serializers.FloatField()
-    ndvi_value = serializers.FloatField(allow_null=True)
-    soil_moisture = serializers.FloatField(allow_null=True)
-    precipitation = serializers.FloatField(allow_null=True)
-    temperature_avg = serializers.FloatField(allow_null=True)
+    
+    class Meta:
+        model = DroughtTimeSeriesRow
+        fields = [
+            'date', 'risk_score', 'ndvi_value', 'soil_moisture',
+            'precipitation', 'temperature_avg'
+        ]
 
 
 class DroughtComparisonSerializer(serializers.Serializer):
@@ -106,23 +179,21 @@ class DroughtComparisonSerializer(serializers.Serializer):
     percentile_rank = serializers.FloatField(help_text="Current conditions percentile vs historical")
 
 
-class DataAvailabilitySerializer(serializers.Serializer):
+class DataAvailabilitySerializer(serializers.ModelSerializer):
     """Serializer for data availability status"""
-    region_id = serializers.IntegerField()
-    region_name = serializers.CharField()
-    
-    # Data availability flags
-    has_ndvi_data = serializers.BooleanField()
-    has_soil_moisture_data = serializers.BooleanField()
-    has_weather_data = serializers.BooleanField()
-    has_risk_assessment = serializers.BooleanField()
-    
-    # Latest data dates
-    latest_ndvi_date = serializers.DateField(allow_null=True)
-    latest_soil_moisture_date = serializers.DateField(allow_null=True)
-    latest_weather_date = serializers.DateField(allow_null=True)
-    latest_assessment_date = serializers.DateField(allow_null=True)
+    region_id = serializers.IntegerField(read_only=True)
+    region_name = serializers.CharField(source='region.name', read_only=True)
     
-    # Data quality scores
-    ndvi_data_quality = serializers.CharField(allow_null=True)
-    overall_data_completeness = serializers.FloatField()  # 0-1 score
\ No newline at end of file
+    class Meta:
+        model = RegionDataAvailability
+        fields = [
+            'region_id', 'region_name',
+            # Data availability flags
+            'has_ndvi_data', 'has_soil_moisture_data', 'has_weather_data',
+            'has_risk_assessment',
+            # Latest data dates
+            'latest_ndvi_date', 'latest_soil_moisture_date', 'latest_weather_date',
+            'latest_assessment_date',
+            # Data quality scores
+            'ndvi_data_quality', 'overall_data_completeness',  # 0-1 score
+        ]
\ No newline at end of file
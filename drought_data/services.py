@@ -4,21 +4,116 @@ This module provides interfaces to external data sources like Google Earth Engin
 NASA POWER API, and OpenWeatherMap
 """
 
+import functools
+import hashlib
+import numpy as np
 import requests
-import json
 import logging
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .models import NDVIData, SoilMoistureData, WeatherData
 from core.models import Region
 
 logger = logging.getLogger(__name__)
 
+# Seasonal multipliers indexed by month (1-12, index 0 unused): raised in
+# the East African rainy seasons (Mar-May, Oct-Nov), lowered in the dry
+# seasons (Dec-Feb, Jun-Aug), neutral in September
+NDVI_SEASONAL = np.array([1.0, 0.8, 0.8, 1.2, 1.2, 1.2, 0.8, 0.8, 0.8, 1.0, 1.2, 1.2, 0.8])
+SOIL_MOISTURE_SEASONAL = np.array([1.0, 0.6, 0.6, 1.5, 1.5, 1.5, 0.6, 0.6, 0.6, 1.0, 1.5, 1.5, 0.6])
 
-class GoogleEarthEngineService:
+# How long provider responses are reused, by how often the source changes
+NDVI_CACHE_TIMEOUT = 7 * 24 * 3600  # 16-day composites
+SOIL_MOISTURE_CACHE_TIMEOUT = 24 * 3600
+HISTORICAL_WEATHER_CACHE_TIMEOUT = 24 * 3600
+CURRENT_WEATHER_CACHE_TIMEOUT = 300
+
+
+def provider_cache_key(prefix, region_id, *args):
+    """Cache key for a provider response for a region and date range"""
+    return ':'.join(['provider', prefix, str(region_id), *map(str, args)])
+
+
+def cached_api(prefix, timeout):
+    """
+    Cache a service method's response per region and arguments. Callers
+    pass bypass_cache=True to fetch fresh data and replace the cached copy.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, region, *args, bypass_cache=False):
+            key = provider_cache_key(prefix, region.id, *args)
+            if not bypass_cache:
+                data = cache.get(key)
+                if data is not None:
+                    return data
+            data = method(self, region, *args)
+            cache.set(key, data, timeout)
+            return data
+        return wrapper
+    return decorator
+
+
+def mock_date_range(start_date: str, end_date: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Days from start_date to end_date inclusive, and the month (1-12) of each"""
+    dates = np.arange(np.datetime64(start_date), np.datetime64(end_date) + 1, dtype='datetime64[D]')
+    months = dates.astype('datetime64[M]').astype(int) % 12 + 1
+    return dates, months
+
+
+def mock_rng(*key) -> np.random.Generator:
+    """
+    Random generator seeded from key, so the same mock request gives the
+    same data in every process
+    """
+    digest = hashlib.blake2b(':'.join(map(str, key)).encode(), digest_size=8).digest()
+    return np.random.default_rng(int.from_bytes(digest, 'big'))
+
+
+def build_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Create a requests session that keeps connections to the provider alive
+    between calls and retries transient gateway errors
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class HTTPServiceMixin:
+    """
+    Lets a service release its pooled connections with close() or by
+    using it as a context manager
+    """
+    
+    def close(self):
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GoogleEarthEngineService(HTTPServiceMixin):
     """
     Service for integrating with Google Earth Engine API
     """
@@ -26,8 +121,13 @@ class GoogleEarthEngineService:
     def __init__(self):
         self.api_key = settings.GOOGLE_EARTH_ENGINE_KEY
         self.base_url = "https://earthengine.googleapis.com/v1"
+        self.session = build_session({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
     
-    def get_ndvi_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def get_ndvi_data(self, region: Region, start_date: str, end_date: str,
+                      bypass_cache: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch NDVI data for a region from Google Earth Engine
         
@@ -35,6 +135,7 @@ class GoogleEarthEngineService:
             region: Region object with coordinates
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
+            bypass_cache: Refetch instead of reusing a cached response
             
         Returns:
             List of NDVI data points
@@ -44,49 +145,53 @@ class GoogleEarthEngineService:
             return self._generate_mock_ndvi_data(region, start_date, end_date)
         
         try:
-            # Define the region geometry
-            geometry = {
-                "type": "Point",
-                "coordinates": [float(region.longitude), float(region.latitude)]
-            }
-            
-            # Create request payload for NDVI calculation
-            payload = {
-                "expression": "NDVI = (B5 - B4) / (B5 + B4)",
-                "fileFormat": "GEO_JSON",
-                "bandIds": ["NDVI"],
-                "region": geometry,
-                "dimensions": "256x256",
-                "crs": "EPSG:4326",
-                "formatOptions": {
-                    "cloudOptimized": True
-                }
-            }
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # This would be the actual API call
-            # response = requests.post(f"{self.base_url}/projects/YOUR_PROJECT/image:computePixels", 
-            #                         json=payload, headers=headers)
-            
-            # For now, return mock data
-            logger.info(f"[MOCK] Fetching NDVI data for {region.name} from {start_date} to {end_date}")
-            return self._generate_mock_ndvi_data(region, start_date, end_date)
+            return self._fetch_ndvi_data(region, start_date, end_date, bypass_cache=bypass_cache)
             
         except Exception as e:
             logger.error(f"Error fetching NDVI data from GEE: {str(e)}")
             return self._generate_mock_ndvi_data(region, start_date, end_date)
     
+    def get_ndvi_point(self, region: Region, date: str, bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """NDVI data point for a single day, or None if there is none"""
+        data = self.get_ndvi_data(region, date, date, bypass_cache=bypass_cache)
+        return data[0] if data else None
+    
+    @cached_api('gee_ndvi', NDVI_CACHE_TIMEOUT)
+    def _fetch_ndvi_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Request NDVI data from Google Earth Engine"""
+        # Define the region geometry
+        geometry = {
+            "type": "Point",
+            "coordinates": [float(region.longitude), float(region.latitude)]
+        }
+        
+        # Create request payload for NDVI calculation
+        payload = {
+            "expression": "NDVI = (B5 - B4) / (B5 + B4)",
+            "fileFormat": "GEO_JSON",
+            "bandIds": ["NDVI"],
+            "region": geometry,
+            "dimensions": "256x256",
+            "crs": "EPSG:4326",
+            "formatOptions": {
+                "cloudOptimized": True
+            }
+        }
+        
+        # This would be the actual API call
+        # response = self.session.post(f"{self.base_url}/projects/YOUR_PROJECT/image:computePixels",
+        #                              data=orjson.dumps(payload))
+        # pixels = orjson.loads(response.content)
+        
+        # For now, return mock data
+        logger.info(f"[MOCK] Fetching NDVI data for {region.name} from {start_date} to {end_date}")
+        return self._generate_mock_ndvi_data(region, start_date, end_date)
+    
     def _generate_mock_ndvi_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Generate realistic mock NDVI data"""
-        import random
-        
-        data = []
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
+        rng = mock_rng('ndvi', region.id, start_date, end_date)
+        dates, months = mock_date_range(start_date, end_date)
+        days = len(dates)
         
         # Base NDVI values depending on region type and season
         base_ndvi = {
@@ -97,34 +202,31 @@ class GoogleEarthEngineService:
         
         base_value = base_ndvi.get(region.region_type, 0.40)
         
-        while current_date <= end_date_obj:
-            # Add seasonal variation (higher NDVI during rainy seasons)
-            month = current_date.month
-            seasonal_factor = 1.0
-            
-            if month in [3, 4, 5, 10, 11]:  # Rainy seasons in East Africa
-                seasonal_factor = 1.2
-            elif month in [12, 1, 2, 6, 7, 8]:  # Dry seasons
-                seasonal_factor = 0.8
-            
-            # Add random variation
-            ndvi_value = base_value * seasonal_factor + random.uniform(-0.15, 0.15)
-            ndvi_value = max(-1.0, min(1.0, ndvi_value))  # Clamp to valid NDVI range
-            
-            data.append({
-                'date': current_date.strftime("%Y-%m-%d"),
-                'ndvi_value': round(ndvi_value, 3),
-                'satellite_source': 'Landsat-8',
-                'cloud_cover_percent': random.uniform(5, 30),
-                'data_quality': random.choice(['excellent', 'good', 'good', 'fair'])
-            })
-            
-            current_date += timedelta(days=1)
+        # Add seasonal variation (higher NDVI during rainy seasons)
+        seasonal_factor = NDVI_SEASONAL[months]
+        
+        # Add random variation
+        ndvi_values = base_value * seasonal_factor + rng.uniform(-0.15, 0.15, days)
+        ndvi_values = np.clip(ndvi_values, -1.0, 1.0).round(3)  # Clamp to valid NDVI range
+        
+        cloud_cover = rng.uniform(5, 30, days)
+        data_quality = rng.choice(['excellent', 'good', 'good', 'fair'], days)
         
-        return data
+        return [
+            {
+                'date': date,
+                'ndvi_value': ndvi_value,
+                'satellite_source': 'Landsat-8',
+                'cloud_cover_percent': cloud_cover_percent,
+                'data_quality': quality
+            }
+            for date, ndvi_value, cloud_cover_percent, quality in zip(
+                dates.astype(str).tolist(), ndvi_values.tolist(), cloud_cover.tolist(), data_quality.tolist()
+            )
+        ]
 
 
-class NASAPowerService:
+class NASAPowerService(HTTPServiceMixin):
     """
     Service for integrating with NASA POWER API for meteorological data
     """
@@ -132,8 +234,10 @@ class NASAPowerService:
     def __init__(self):
         self.api_key = settings.NASA_POWER_API_KEY
         self.base_url = "https://power.larc.nasa.gov/api/temporal/daily/point"
+        self.session = build_session()
     
-    def get_soil_moisture_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def get_soil_moisture_data(self, region: Region, start_date: str, end_date: str,
+                               bypass_cache: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch soil moisture data from NASA POWER API
         """
@@ -142,74 +246,85 @@ class NASAPowerService:
             return self._generate_mock_soil_moisture_data(region, start_date, end_date)
         
         try:
-            params = {
-                'parameters': 'GWETROOT,GWETTOP',  # Root zone and surface soil wetness
-                'community': 'AG',  # Agricultural community
-                'longitude': float(region.longitude),
-                'latitude': float(region.latitude),
-                'start': start_date.replace('-', ''),
-                'end': end_date.replace('-', ''),
-                'format': 'JSON'
-            }
-            
-            # This would be the actual API call
-            # response = requests.get(self.base_url, params=params)
-            
-            # For now, return mock data
-            logger.info(f"[MOCK] Fetching soil moisture data for {region.name} from {start_date} to {end_date}")
-            return self._generate_mock_soil_moisture_data(region, start_date, end_date)
+            return self._fetch_soil_moisture_data(region, start_date, end_date, bypass_cache=bypass_cache)
             
         except Exception as e:
             logger.error(f"Error fetching soil moisture data from NASA POWER: {str(e)}")
             return self._generate_mock_soil_moisture_data(region, start_date, end_date)
     
+    def get_soil_moisture_point(self, region: Region, date: str,
+                                bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """Soil moisture data point for a single day, or None if there is none"""
+        data = self.get_soil_moisture_data(region, date, date, bypass_cache=bypass_cache)
+        return data[0] if data else None
+    
+    @cached_api('nasa_soil_moisture', SOIL_MOISTURE_CACHE_TIMEOUT)
+    def _fetch_soil_moisture_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Request soil moisture data from NASA POWER"""
+        params = {
+            'parameters': 'GWETROOT,GWETTOP',  # Root zone and surface soil wetness
+            'community': 'AG',  # Agricultural community
+            'longitude': float(region.longitude),
+            'latitude': float(region.latitude),
+            'start': start_date.replace('-', ''),
+            'end': end_date.replace('-', ''),
+            'format': 'JSON'
+        }
+        
+        # This would be the actual API call
+        # response = self.session.get(self.base_url, params=params)
+        # power_data = orjson.loads(response.content)
+        
+        # For now, return mock data
+        logger.info(f"[MOCK] Fetching soil moisture data for {region.name} from {start_date} to {end_date}")
+        return self._generate_mock_soil_moisture_data(region, start_date, end_date)
+    
     def _generate_mock_soil_moisture_data(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Generate realistic mock soil moisture data"""
-        import random
-        
-        data = []
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
+        rng = mock_rng('soil_moisture', region.id, start_date, end_date)
+        dates, months = mock_date_range(start_date, end_date)
+        days = len(dates)
         
         # Base soil moisture (percentage)
         base_moisture = 35.0
         
-        while current_date <= end_date_obj:
-            # Add seasonal and random variation
-            month = current_date.month
-            seasonal_factor = 1.0
-            
-            if month in [3, 4, 5, 10, 11]:  # Rainy seasons
-                seasonal_factor = 1.5
-            elif month in [12, 1, 2, 6, 7, 8]:  # Dry seasons
-                seasonal_factor = 0.6
-            
-            moisture_value = base_moisture * seasonal_factor + random.uniform(-10, 10)
-            moisture_value = max(5.0, min(80.0, moisture_value))  # Clamp to realistic range
-            
-            data.append({
-                'date': current_date.strftime("%Y-%m-%d"),
-                'moisture_percent': round(moisture_value, 1),
+        # Add seasonal and random variation
+        seasonal_factor = SOIL_MOISTURE_SEASONAL[months]
+        
+        moisture_values = base_moisture * seasonal_factor + rng.uniform(-10, 10, days)
+        moisture_values = np.clip(moisture_values, 5.0, 80.0).round(1)  # Clamp to realistic range
+        
+        temperatures = rng.uniform(20, 35, days).round(1)
+        
+        return [
+            {
+                'date': date,
+                'moisture_percent': moisture_percent,
                 'soil_depth_cm': 10,
                 'data_source': 'satellite',
-                'temperature_celsius': round(random.uniform(20, 35), 1)
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return data
+                'temperature_celsius': temperature
+            }
+            for date, moisture_percent, temperature in zip(
+                dates.astype(str).tolist(), moisture_values.tolist(), temperatures.tolist()
+            )
+        ]
 
 
-class OpenWeatherMapService:
+class OpenWeatherMapService(HTTPServiceMixin):
     """
     Service for integrating with OpenWeatherMap API
     """
     
+    # Shared by all instances so concurrent region collections stay within
+    # the free tier's request rate
+    request_slots = threading.BoundedSemaphore(settings.OPENWEATHER_CONCURRENCY)
+    
     def __init__(self):
         self.api_key = settings.OPENWEATHER_API_KEY
         self.base_url = "http://api.openweathermap.org/data/2.5"
+        self.session = build_session()
     
-    def get_current_weather(self, region: Region) -> Dict[str, Any]:
+    def get_current_weather(self, region: Region, bypass_cache: bool = False) -> Dict[str, Any]:
         """
         Get current weather data for a region
         """
@@ -218,25 +333,33 @@ class OpenWeatherMapService:
             return self._generate_mock_current_weather(region)
         
         try:
-            params = {
-                'lat': float(region.latitude),
-                'lon': float(region.longitude),
-                'appid': self.api_key,
-                'units': 'metric'
-            }
+            return self._fetch_current_weather(region, bypass_cache=bypass_cache)
             
+        except Exception as e:
+            logger.error(f"Error fetching weather data from OpenWeatherMap: {str(e)}")
+            return self._generate_mock_current_weather(region)
+    
+    @cached_api('owm_current', CURRENT_WEATHER_CACHE_TIMEOUT)
+    def _fetch_current_weather(self, region: Region) -> Dict[str, Any]:
+        """Request current weather from OpenWeatherMap"""
+        params = {
+            'lat': float(region.latitude),
+            'lon': float(region.longitude),
+            'appid': self.api_key,
+            'units': 'metric'
+        }
+        
+        with self.request_slots:
             # This would be the actual API call
-            # response = requests.get(f"{self.base_url}/weather", params=params)
+            # response = self.session.get(f"{self.base_url}/weather", params=params)
+            # weather = orjson.loads(response.content)
             
             # For now, return mock data
             logger.info(f"[MOCK] Fetching current weather for {region.name}")
             return self._generate_mock_current_weather(region)
-            
-        except Exception as e:
-            logger.error(f"Error fetching weather data from OpenWeatherMap: {str(e)}")
-            return self._generate_mock_current_weather(region)
     
-    def get_historical_weather(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    def get_historical_weather(self, region: Region, start_date: str, end_date: str,
+                               bypass_cache: bool = False) -> List[Dict[str, Any]]:
         """
         Get historical weather data for a region
         """
@@ -245,18 +368,30 @@ class OpenWeatherMapService:
             return self._generate_mock_historical_weather(region, start_date, end_date)
         
         try:
-            # OpenWeatherMap requires timestamps for historical data
-            start_timestamp = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
-            end_timestamp = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp())
+            return self._fetch_historical_weather(region, start_date, end_date, bypass_cache=bypass_cache)
             
+        except Exception as e:
+            logger.error(f"Error fetching historical weather data: {str(e)}")
+            return self._generate_mock_historical_weather(region, start_date, end_date)
+    
+    def get_historical_weather_point(self, region: Region, date: str,
+                                     bypass_cache: bool = False) -> Optional[Dict[str, Any]]:
+        """Weather for a single past day, or None if there is none"""
+        data = self.get_historical_weather(region, date, date, bypass_cache=bypass_cache)
+        return data[0] if data else None
+    
+    @cached_api('owm_historical', HISTORICAL_WEATHER_CACHE_TIMEOUT)
+    def _fetch_historical_weather(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Request historical weather from OpenWeatherMap"""
+        # OpenWeatherMap requires timestamps for historical data
+        start_timestamp = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
+        end_timestamp = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp())
+        
+        with self.request_slots:
             # For historical data, we'd need to make multiple API calls
             # This is a simplified version
             logger.info(f"[MOCK] Fetching historical weather for {region.name} from {start_date} to {end_date}")
             return self._generate_mock_historical_weather(region, start_date, end_date)
-            
-        except Exception as e:
-            logger.error(f"Error fetching historical weather data: {str(e)}")
-            return self._generate_mock_historical_weather(region, start_date, end_date)
     
     def _generate_mock_current_weather(self, region: Region) -> Dict[str, Any]:
         """Generate realistic mock current weather data"""
@@ -278,37 +413,39 @@ class OpenWeatherMapService:
     
     def _generate_mock_historical_weather(self, region: Region, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """Generate realistic mock historical weather data"""
-        import random
-        
-        data = []
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        while current_date <= end_date_obj:
-            temp_avg = random.uniform(20, 32)
-            precipitation = 0.0
-            
-            # Simulate rainy days (30% chance)
-            if random.random() < 0.3:
-                precipitation = random.uniform(0.5, 25.0)
-            
-            data.append({
-                'date': current_date.strftime("%Y-%m-%d"),
-                'temperature_max': round(temp_avg + random.uniform(2, 8), 1),
-                'temperature_min': round(temp_avg - random.uniform(3, 8), 1),
-                'temperature_avg': round(temp_avg, 1),
-                'precipitation_mm': round(precipitation, 1),
-                'humidity_percent': random.randint(35, 85),
-                'wind_speed_kmh': round(random.uniform(5, 20), 1),
+        rng = mock_rng('historical_weather', region.id, start_date, end_date)
+        dates, _ = mock_date_range(start_date, end_date)
+        days = len(dates)
+        
+        temp_avg = rng.uniform(20, 32, days)
+        
+        # Simulate rainy days (30% chance)
+        precipitation = np.where(rng.random(days) < 0.3, rng.uniform(0.5, 25.0, days), 0.0)
+        
+        return [
+            {
+                'date': date,
+                'temperature_max': temperature_max,
+                'temperature_min': temperature_min,
+                'temperature_avg': temperature_avg,
+                'precipitation_mm': precipitation_mm,
+                'humidity_percent': humidity,
+                'wind_speed_kmh': wind_speed,
                 'data_source': 'OpenWeatherMap'
-            })
-            
-            current_date += timedelta(days=1)
-        
-        return data
+            }
+            for date, temperature_max, temperature_min, temperature_avg, precipitation_mm, humidity, wind_speed in zip(
+                dates.astype(str).tolist(),
+                (temp_avg + rng.uniform(2, 8, days)).round(1).tolist(),
+                (temp_avg - rng.uniform(3, 8, days)).round(1).tolist(),
+                temp_avg.round(1).tolist(),
+                precipitation.round(1).tolist(),
+                rng.integers(35, 85, days, endpoint=True).tolist(),
+                rng.uniform(5, 20, days).round(1).tolist(),
+            )
+        ]
 
 
-class DataIntegrationService:
+class DataIntegrationService(HTTPServiceMixin):
     """
     Main service that orchestrates data collection from multiple sources
     """
@@ -318,6 +455,11 @@ class DataIntegrationService:
         self.nasa_service = NASAPowerService()
         self.weather_service = OpenWeatherMapService()
     
+    def close(self):
+        """Release the provider services' pooled connections"""
+        for service in (self.gee_service, self.nasa_service, self.weather_service):
+            service.close()
+    
     def collect_all_data_for_region(self, region, date: str = None) -> Dict[str, Any]:
         """
         Collect all types of data for a region on a specific date
@@ -335,14 +477,7 @@ class DataIntegrationService:
             try:
                 region_obj = Region.objects.get(name=region, region_type='county')
             except Region.DoesNotExist:
-                return {
-                    'region': region,
-                    'date': date or timezone.now().date().strftime("%Y-%m-%d"),
-                    'ndvi_data': None,
-                    'soil_moisture_data': None,
-                    'weather_data': None,
-                    'errors': [f'Region "{region}" not found']
-                }
+                return self._failed_collection(region, date, f'Region "{region}" not found')
         else:
             region_obj = region
         
@@ -358,35 +493,96 @@ class DataIntegrationService:
             'errors': []
         }
         
-        try:
-            # Collect NDVI data
-            ndvi_data = self.gee_service.get_ndvi_data(region_obj, date, date)
-            if ndvi_data:
-                results['ndvi_data'] = ndvi_data[0]  # Get first (and only) day
+        # Query the three providers concurrently; each service uses its own
+        # session, so no connection pool is shared between threads
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            collections = [
+                ('ndvi_data', 'NDVI', executor.submit(
+                    self.gee_service.get_ndvi_point, region_obj, date)),
+                ('soil_moisture_data', 'Soil moisture', executor.submit(
+                    self.nasa_service.get_soil_moisture_point, region_obj, date)),
+                ('weather_data', 'Weather', executor.submit(
+                    self.weather_service.get_historical_weather_point, region_obj, date)),
+            ]
+        
+        for key, label, future in collections:
+            try:
+                results[key] = future.result()
             
-        except Exception as e:
-            results['errors'].append(f"NDVI collection failed: {str(e)}")
+            except Exception as e:
+                results['errors'].append(f"{label} collection failed: {str(e)}")
         
-        try:
-            # Collect soil moisture data
-            soil_data = self.nasa_service.get_soil_moisture_data(region_obj, date, date)
-            if soil_data:
-                results['soil_moisture_data'] = soil_data[0]  # Get first (and only) day
-            
-        except Exception as e:
-            results['errors'].append(f"Soil moisture collection failed: {str(e)}")
+        return results
+    
+    def collect_all_data_for_regions(self, regions, date: str = None, max_concurrency: int = None,
+                                     timeout: float = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Collect all types of data for several regions at once
         
-        try:
-            # Collect weather data
-            weather_data = self.weather_service.get_historical_weather(region_obj, date, date)
-            if weather_data:
-                results['weather_data'] = weather_data[0]  # Get first (and only) day
+        Args:
+            regions: Region objects or region name strings
+            date: Date in YYYY-MM-DD format (defaults to today)
+            max_concurrency: Regions collected at the same time
+                (defaults to settings.DATA_FETCH_CONCURRENCY)
+            timeout: Seconds to wait for the whole batch
+                (defaults to settings.DATA_FETCH_TIMEOUT)
             
-        except Exception as e:
-            results['errors'].append(f"Weather collection failed: {str(e)}")
+        Returns:
+            Dictionary of collect_all_data_for_region results by region name
+        """
+        max_concurrency = max_concurrency or settings.DATA_FETCH_CONCURRENCY
+        timeout = timeout or settings.DATA_FETCH_TIMEOUT
+        
+        # Look up all county names in one query rather than one per region
+        names = [region for region in regions if isinstance(region, str)]
+        counties = {
+            county.name: county
+            for county in Region.objects.filter(name__in=names, region_type='county')
+        } if names else {}
+        
+        results = {}
+        to_collect = []
+        for region in regions:
+            if isinstance(region, str) and region not in counties:
+                results[region] = self._failed_collection(region, date, f'Region "{region}" not found')
+            else:
+                to_collect.append(counties.get(region, region) if isinstance(region, str) else region)
+        
+        def collect(region):
+            try:
+                return self.collect_all_data_for_region(region, date)
+            finally:
+                # Worker threads get their own database connection
+                connection.close()
+        
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        futures = {region.name: executor.submit(collect, region) for region in to_collect}
+        wait(futures.values(), timeout=timeout)
+        # Don't hold the batch for regions still waiting on a provider
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        for region_name, future in futures.items():
+            if future.done() and not future.cancelled():
+                results[region_name] = future.result()
+            else:
+                results[region_name] = self._failed_collection(
+                    region_name, date, f'Collection timed out after {timeout} seconds'
+                )
         
         return results
     
+    @staticmethod
+    def _failed_collection(region_name: str, date: Optional[str], error: str) -> Dict[str, Any]:
+        """collect_all_data_for_region result for a region that was not collected"""
+        return {
+            'region': region_name,
+            'date': date or timezone.now().date().strftime("%Y-%m-%d"),
+            'ndvi_data': None,
+            'soil_moisture_data': None,
+            'weather_data': None,
+            'errors': [error]
+        }
+    
     def collect_historical_data_for_region(self, region: Region, days_back: int = 30) -> Dict[str, Any]:
         """
         Collect historical data for a region
@@ -416,19 +612,19 @@ class DataIntegrationService:
             # Collect NDVI data
             ndvi_data = self.gee_service.get_ndvi_data(region, start_date_str, end_date_str)
             
-            for day_data in ndvi_data:
-                ndvi_obj, created = NDVIData.objects.get_or_create(
+            # Re-collected days update their existing rows
+            NDVIData.objects.upsert_many([
+                NDVIData(
                     region=region,
-                    date=datetime.strptime(day_data['date'], "%Y-%m-%d").date(),
-                    defaults={
-                        'ndvi_value': day_data['ndvi_value'],
-                        'satellite_source': day_data['satellite_source'],
-                        'cloud_cover_percent': day_data['cloud_cover_percent'],
-                        'data_quality': day_data['data_quality']
-                    }
+                    date=date.fromisoformat(day_data['date']),
+                    ndvi_value=day_data['ndvi_value'],
+                    satellite_source=day_data['satellite_source'],
+                    cloud_cover_percent=day_data['cloud_cover_percent'],
+                    data_quality=day_data['data_quality']
                 )
-                if created:
-                    results['days_collected'] += 1
+                for day_data in ndvi_data
+            ])
+            results['days_collected'] = len(ndvi_data)
             
         except Exception as e:
             results['errors'].append(f"NDVI collection failed: {str(e)}")
@@ -437,17 +633,17 @@ class DataIntegrationService:
             # Collect soil moisture data
             soil_data = self.nasa_service.get_soil_moisture_data(region, start_date_str, end_date_str)
             
-            for day_data in soil_data:
-                soil_obj, created = SoilMoistureData.objects.get_or_create(
+            SoilMoistureData.objects.upsert_many([
+                SoilMoistureData(
                     region=region,
-                    date=datetime.strptime(day_data['date'], "%Y-%m-%d").date(),
-                    defaults={
-                        'moisture_percent': day_data['moisture_percent'],
-                        'soil_depth_cm': day_data['soil_depth_cm'],
-                        'data_source': day_data['data_source'],
-                        'temperature_celsius': day_data['temperature_celsius']
-                    }
+                    date=date.fromisoformat(day_data['date']),
+                    moisture_percent=day_data['moisture_percent'],
+                    soil_depth_cm=day_data['soil_depth_cm'],
+                    data_source=day_data['data_source'],
+                    temperature_celsius=day_data['temperature_celsius']
                 )
+                for day_data in soil_data
+            ])
             
         except Exception as e:
             results['errors'].append(f"Soil moisture collection failed: {str(e)}")
@@ -456,20 +652,20 @@ class DataIntegrationService:
             # Collect weather data
             weather_data = self.weather_service.get_historical_weather(region, start_date_str, end_date_str)
             
-            for day_data in weather_data:
-                weather_obj, created = WeatherData.objects.get_or_create(
+            WeatherData.objects.upsert_many([
+                WeatherData(
                     region=region,
-                    date=datetime.strptime(day_data['date'], "%Y-%m-%d").date(),
-                    defaults={
-                        'temperature_max': day_data['temperature_max'],
-                        'temperature_min': day_data['temperature_min'],
-                        'temperature_avg': day_data['temperature_avg'],
-                        'precipitation_mm': day_data['precipitation_mm'],
-                        'humidity_percent': day_data['humidity_percent'],
-                        'wind_speed_kmh': day_data['wind_speed_kmh'],
-                        'data_source': day_data['data_source']
-                    }
+                    date=date.fromisoformat(day_data['date']),
+                    temperature_max=day_data['temperature_max'],
+                    temperature_min=day_data['temperature_min'],
+                    temperature_avg=day_data['temperature_avg'],
+                    precipitation_mm=day_data['precipitation_mm'],
+                    humidity_percent=day_data['humidity_percent'],
+                    wind_speed_kmh=day_data['wind_speed_kmh'],
+                    data_source=day_data['data_source']
                 )
+                for day_data in weather_data
+            ])
             
         except Exception as e:
             results['errors'].append(f"Weather collection failed: {str(e)}")
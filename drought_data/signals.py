@@ -0,0 +1,68 @@
+"""
+Signal handlers for drought data models
+"""
+from datetime import timedelta
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import WeatherData, NDVIData, SoilMoistureData
+
+# Component scores look back over a 30-day window
+COMPONENT_SCORE_WINDOW_DAYS = 30
+COMPONENT_SCORE_CACHE_TIMEOUT = 3600
+
+
+def component_score_cache_key(source, region_id, end_date):
+    """Cache key for a region's component drought score on a given date"""
+    return f"dscore:{source}:{region_id}:{end_date}"
+
+
+# Component score source for each reading model
+COMPONENT_SCORE_SOURCES = {
+    WeatherData: 'weather',
+    NDVIData: 'ndvi',
+    SoilMoistureData: 'soil',
+}
+
+
+def component_score_cache_keys(source, region_id, date):
+    """Cache keys of the component scores whose window includes the given date"""
+    return [
+        component_score_cache_key(source, region_id, date + timedelta(days=offset))
+        for offset in range(COMPONENT_SCORE_WINDOW_DAYS + 1)
+    ]
+
+
+def invalidate_component_scores(source, region_id, date):
+    """Drop cached component scores whose window includes the given date"""
+    cache.delete_many(component_score_cache_keys(source, region_id, date))
+
+
+def invalidate_bulk_component_scores(model, records):
+    """
+    Drop cached component scores for readings written in bulk, which
+    send no post_save
+    """
+    source = COMPONENT_SCORE_SOURCES.get(model)
+    if source is None:
+        return
+    keys = set()
+    for region_id, date in {(record.region_id, record.date) for record in records}:
+        keys.update(component_score_cache_keys(source, region_id, date))
+    cache.delete_many(list(keys))
+
+
+@receiver([post_save, post_delete], sender=WeatherData)
+def weather_data_changed(sender, instance, **kwargs):
+    invalidate_component_scores('weather', instance.region_id, instance.date)
+
+
+@receiver([post_save, post_delete], sender=NDVIData)
+def ndvi_data_changed(sender, instance, **kwargs):
+    invalidate_component_scores('ndvi', instance.region_id, instance.date)
+
+
+@receiver([post_save, post_delete], sender=SoilMoistureData)
+def soil_data_changed(sender, instance, **kwargs):
+    invalidate_component_scores('soil', instance.region_id, instance.date)
@@ -6,7 +6,10 @@ import logging
 import json
 from typing import Optional, Dict, Any
 
-from .models import NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment
+from .models import (
+    NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment, DroughtTimeSeriesRow,
+    RegionDataAvailability
+)
 from core.models import Region
 from django.conf import settings
 from .services import DataIntegrationService
@@ -37,8 +40,8 @@ def fetch_ndvi_data_for_region(region_id: int, date_str: str = None) -> Dict[str
             return {'status': 'exists', 'region': region.name, 'date': str(date)}
         
         # Use data integration service
-        integration_service = DataIntegrationService()
-        data_result = integration_service.collect_all_data_for_region(region, date_str or str(date))
+        with DataIntegrationService() as integration_service:
+            data_result = integration_service.collect_all_data_for_region(region, date_str or str(date))
         
         if data_result['ndvi_data']:
             ndvi_info = data_result['ndvi_data']
@@ -178,6 +181,18 @@ def fetch_weather_data_for_region(region_id: int, date_str: str = None) -> Dict[
         return {'status': 'error', 'message': str(e)}
 
 
+@shared_task
+def fetch_all_data_for_region(region_id: int, date_str: str = None) -> Dict[str, Any]:
+    """
+    Fetch NDVI, soil moisture and weather data for a region in a single task
+    """
+    return {
+        'ndvi': fetch_ndvi_data_for_region(region_id, date_str),
+        'soil_moisture': fetch_soil_moisture_data_for_region(region_id, date_str),
+        'weather': fetch_weather_data_for_region(region_id, date_str),
+    }
+
+
 @shared_task
 def calculate_drought_risk_for_region(region_id: int, assessment_date_str: str = None) -> Dict[str, Any]:
     """
@@ -280,8 +295,8 @@ def collect_historical_data_for_region(region_id: int, days_back: int = 30) -> D
     try:
         region = Region.objects.get(id=region_id)
         
-        integration_service = DataIntegrationService()
-        result = integration_service.collect_historical_data_for_region(region, days_back)
+        with DataIntegrationService() as integration_service:
+            result = integration_service.collect_historical_data_for_region(region, days_back)
         
         logger.info(f"Collected {result['days_collected']} days of historical data for {region.name}")
         return result
@@ -330,6 +345,41 @@ def fetch_all_data_for_all_regions(date_str: str = None):
     return results
 
 
+@shared_task
+def warm_provider_cache(date_str: str = None) -> Dict[str, Any]:
+    """
+    Collect provider data for every county ahead of the data fetch tasks,
+    so their requests are served from the provider cache
+    """
+    counties = list(Region.objects.filter(region_type='county'))
+    
+    with DataIntegrationService() as integration_service:
+        results = integration_service.collect_all_data_for_regions(counties, date_str)
+    
+    failed = [name for name, result in results.items() if result['errors']]
+    logger.info(f"Warmed provider cache for {len(results) - len(failed)} of {len(results)} counties")
+    return {'regions': len(results), 'failed': failed}
+
+
+@shared_task
+def refresh_drought_time_series():
+    """
+    Refresh the materialized view behind the drought time series endpoint
+    """
+    DroughtTimeSeriesRow.refresh()
+    logger.info("Refreshed drought time series view")
+
+
+@shared_task
+def refresh_data_availability():
+    """
+    Refresh the data availability rollup for all regions, picking up new
+    regions and risk assessments written outside the bulk ingest
+    """
+    rows = RegionDataAvailability.refresh()
+    logger.info(f"Refreshed data availability for {len(rows)} regions")
+
+
 # Helper functions for mock data generation and risk calculation
 def _generate_mock_ndvi_value(region: Region) -> float:
     """Generate realistic mock NDVI values based on region"""
@@ -521,11 +571,11 @@ def bulk_assess_drought_risk_all_regions(date_str: str = None) -> Dict[str, Any]
             date = timezone.now().date()
         
         # Get all county regions
-        regions = Region.objects.filter(region_type='county')
+        regions = list(Region.objects.filter(region_type='county'))
         
         results = {
             'date': str(date),
-            'total_regions': regions.count(),
+            'total_regions': len(regions),
             'assessments_created': 0,
             'assessments_failed': 0,
             'risk_summary': {
@@ -541,26 +591,26 @@ def bulk_assess_drought_risk_all_regions(date_str: str = None) -> Dict[str, Any]
         # Initialize early warning system
         ews = DroughtEarlyWarningSystem()
         
-        for region in regions:
-            try:
-                # Create assessment
-                assessment = ews.assess_drought_risk(region, date)
-                
-                results['assessments_created'] += 1
-                results['risk_summary'][assessment.risk_level] += 1
-                
-                logger.info(
-                    f"Assessed {region.name}: {assessment.risk_level} "
-                    f"(score: {assessment.risk_score})"
-                )
-                
-            except Exception as e:
-                results['assessments_failed'] += 1
-                results['failed_regions'].append({
-                    'region': region.name,
-                    'error': str(e)
-                })
-                logger.error(f"Failed to assess {region.name}: {e}")
+        # Create or update all assessments with bulk upserts
+        assessments, errors = ews.assess_drought_risk_batch(regions, date)
+        
+        risk_summary = results['risk_summary']
+        for assessment in assessments:
+            results['assessments_created'] += 1
+            risk_summary[assessment.risk_level] = risk_summary.get(assessment.risk_level, 0) + 1
+            
+            logger.info(
+                f"Assessed {assessment.region.name}: {assessment.risk_level} "
+                f"(score: {assessment.risk_score})"
+            )
+        
+        for region_name, error in errors.items():
+            results['assessments_failed'] += 1
+            results['failed_regions'].append({
+                'region': region_name,
+                'error': error
+            })
+            logger.error(f"Failed to assess {region_name}: {error}")
         
         logger.info(
             f"Bulk assessment completed: {results['assessments_created']} successful, "
@@ -2,28 +2,76 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Avg, Max, Min, Count, Sum
+from django.db.models import Q, Avg, Max, Min, Count, Sum, OuterRef, Subquery
 from django.db import models
 from django.utils import timezone
 from datetime import datetime, timedelta
 import statistics
+import numpy as np
 
-from .models import NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment
+from .models import (
+    NDVIData, SoilMoistureData, WeatherData, DroughtRiskAssessment, DroughtTimeSeriesRow,
+    RegionDataAvailability
+)
 from .serializers import (
     NDVIDataSerializer, SoilMoistureDataSerializer, WeatherDataSerializer,
     DroughtRiskAssessmentSerializer, RegionalDroughtSummarySerializer,
     DroughtTimeSeriesSerializer, DroughtComparisonSerializer,
-    DataAvailabilitySerializer
+    DataAvailabilitySerializer, NDVIDataLiteSerializer, SoilMoistureDataLiteSerializer,
+    WeatherDataLiteSerializer, DroughtRiskAssessmentLiteSerializer
 )
 from core.models import Region
+from core.serializers import RegionSummarySerializer
+
+
+def risk_score_stats(scores):
+    """Summary statistics for an array of risk scores"""
+    if not scores.size:
+        return {'average_risk_score': None, 'max_risk_score': None, 'min_risk_score': None, 'assessments': 0}
+    return {
+        'average_risk_score': float(scores.mean()),
+        'max_risk_score': float(scores.max()),
+        'min_risk_score': float(scores.min()),
+        'assessments': int(scores.size),
+    }
+
+
+class ValuesListMixin:
+    """
+    Lists rows as .values() dicts through list_serializer_class instead of
+    model instances; each region on the page is serialized once
+    """
+    list_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        fields = [name for name in self.list_serializer_class().fields if name != 'region']
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None)
+        queryset = queryset.values(*fields, 'region_id')
+        
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        
+        regions = Region.objects.filter(
+            pk__in={row['region_id'] for row in rows}
+        ).select_related('parent_region')
+        context = self.get_serializer_context()
+        context['regions'] = {
+            region['id']: region for region in RegionSummarySerializer(regions, many=True).data
+        }
+        serializer = self.list_serializer_class(rows, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
 
-class NDVIDataViewSet(viewsets.ModelViewSet):
+class NDVIDataViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for NDVI data management
     """
     queryset = NDVIData.objects.all()
     serializer_class = NDVIDataSerializer
+    list_serializer_class = NDVIDataLiteSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['region', 'date', 'satellite_source', 'data_quality']
@@ -46,13 +94,8 @@ class NDVIDataViewSet(viewsets.ModelViewSet):
                 return Response({'error': 'Invalid region ID'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Get latest for all regions
-        latest_data = []
-        regions = Region.objects.all()
-        
-        for region in regions:
-            latest = NDVIData.objects.filter(region=region).order_by('-date').first()
-            if latest:
-                latest_data.append(latest)
+        regions = Region.objects.prefetch_related(NDVIData.objects.recent_prefetch('latest_ndvi'))
+        latest_data = [region.latest_ndvi[0] for region in regions if region.latest_ndvi]
         
         serializer = self.get_serializer(latest_data, many=True)
         return Response(serializer.data)
@@ -104,12 +147,13 @@ class NDVIDataViewSet(viewsets.ModelViewSet):
         return Response(stats)
 
 
-class SoilMoistureDataViewSet(viewsets.ModelViewSet):
+class SoilMoistureDataViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Soil Moisture data management
     """
     queryset = SoilMoistureData.objects.all()
     serializer_class = SoilMoistureDataSerializer
+    list_serializer_class = SoilMoistureDataLiteSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['region', 'date', 'data_source', 'soil_depth_cm']
@@ -132,24 +176,20 @@ class SoilMoistureDataViewSet(viewsets.ModelViewSet):
                 return Response({'error': 'Invalid region ID'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Get latest for all regions
-        latest_data = []
-        regions = Region.objects.all()
-        
-        for region in regions:
-            latest = SoilMoistureData.objects.filter(region=region).order_by('-date').first()
-            if latest:
-                latest_data.append(latest)
+        regions = Region.objects.prefetch_related(SoilMoistureData.objects.recent_prefetch('latest_soil_moisture'))
+        latest_data = [region.latest_soil_moisture[0] for region in regions if region.latest_soil_moisture]
         
         serializer = self.get_serializer(latest_data, many=True)
         return Response(serializer.data)
 
 
-class WeatherDataViewSet(viewsets.ModelViewSet):
+class WeatherDataViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Weather data management
     """
     queryset = WeatherData.objects.all()
     serializer_class = WeatherDataSerializer
+    list_serializer_class = WeatherDataLiteSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['region', 'date', 'data_source']
@@ -181,12 +221,13 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
         return Response(summary)
 
 
-class DroughtRiskAssessmentViewSet(viewsets.ModelViewSet):
+class DroughtRiskAssessmentViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Drought Risk Assessment management
     """
     queryset = DroughtRiskAssessment.objects.all()
     serializer_class = DroughtRiskAssessmentSerializer
+    list_serializer_class = DroughtRiskAssessmentLiteSerializer
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['region', 'assessment_date', 'risk_level']
@@ -196,16 +237,10 @@ class DroughtRiskAssessmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def current_risk_map(self, request):
         """Get current drought risk for all regions"""
-        latest_assessments = []
-        regions = Region.objects.all()
-        
-        for region in regions:
-            latest = DroughtRiskAssessment.objects.filter(
-                region=region
-            ).order_by('-assessment_date').first()
-            
-            if latest:
-                latest_assessments.append(latest)
+        regions = Region.objects.prefetch_related(
+            DroughtRiskAssessment.objects.recent_prefetch('latest_assessments')
+        )
+        latest_assessments = [region.latest_assessments[0] for region in regions if region.latest_assessments]
         
         serializer = self.get_serializer(latest_assessments, many=True)
         return Response(serializer.data)
@@ -247,52 +282,115 @@ class DroughtRiskAssessmentViewSet(viewsets.ModelViewSet):
         
         return Response(summary)
     
+    @action(detail=False, methods=['get'])
+    def time_series(self, request):
+        """Get daily risk scores and readings for a region"""
+        region_id = request.query_params.get('region')
+        days = int(request.query_params.get('days', 90))
+        
+        if not region_id:
+            return Response({'error': 'region parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        end_date = timezone.now().date()
+        start_date = end_date - timedelta(days=days)
+        
+        # Pre-joined by the drought_timeseries_mv materialized view
+        data = DroughtTimeSeriesRow.objects.filter(
+            region_id=region_id,
+            date__gte=start_date,
+            date__lte=end_date
+        ).order_by('date')
+        
+        serializer = DroughtTimeSeriesSerializer(data, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def comparison(self, request):
+        """Compare a region's recent drought risk with the previous period and its history"""
+        region_id = request.query_params.get('region')
+        days = int(request.query_params.get('days', 30))
+        
+        if not region_id:
+            return Response({'error': 'region parameter is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        history = list(DroughtRiskAssessment.objects.filter(
+            region_id=region_id
+        ).order_by('assessment_date').values_list('assessment_date', 'risk_score'))
+        
+        if not history:
+            return Response({'message': 'No assessment data available'})
+        
+        dates = np.array([assessment_date for assessment_date, _ in history], dtype='datetime64[D]')
+        scores = np.array([risk_score for _, risk_score in history])
+        
+        end_date = timezone.now().date()
+        current_start = end_date - timedelta(days=days)
+        previous_start = current_start - timedelta(days=days)
+        previous_index, current_index = np.searchsorted(
+            dates, np.array([previous_start, current_start], dtype='datetime64[D]')
+        )
+        end_index = np.searchsorted(dates, np.datetime64(end_date), side='right')
+        
+        # Share of historical assessments at or below the latest risk score
+        sorted_scores = np.sort(scores)
+        percentile_rank = 100 * np.searchsorted(sorted_scores, scores[-1], side='right') / scores.size
+        
+        comparison = {
+            'current_period': risk_score_stats(scores[current_index:end_index]),
+            'previous_period': risk_score_stats(scores[previous_index:current_index]),
+            'historical_average': risk_score_stats(scores),
+            'percentile_rank': percentile_rank,
+        }
+        
+        serializer = DroughtComparisonSerializer(comparison)
+        return Response(serializer.data)
+    
     @action(detail=False, methods=['get'])
     def regional_summary(self, request):
         """Get detailed summary for all regions"""
-        summaries = []
-        regions = Region.objects.all()
+        # Latest readings per region, fetched for all regions in one query
+        latest_assessment = DroughtRiskAssessment.objects.filter(
+            region=OuterRef('pk')
+        ).order_by('-assessment_date')
+        latest_ndvi = NDVIData.objects.filter(region=OuterRef('pk')).order_by('-date')
+        latest_soil_moisture = SoilMoistureData.objects.filter(region=OuterRef('pk')).order_by('-date')
+        recent_weather = WeatherData.objects.filter(
+            region=OuterRef('pk'),
+            precipitation_mm__gt=1.0
+        ).order_by('-date')
+        
+        regions = Region.objects.annotate(
+            current_risk_level=Subquery(latest_assessment.values('risk_level')[:1]),
+            current_risk_score=Subquery(latest_assessment.values('risk_score')[:1]),
+            last_assessment_date=Subquery(latest_assessment.values('assessment_date')[:1]),
+            latest_ndvi=Subquery(latest_ndvi.values('ndvi_value')[:1]),
+            latest_soil_moisture=Subquery(latest_soil_moisture.values('moisture_percent')[:1]),
+            last_rain_date=Subquery(recent_weather.values('date')[:1]),
+        ).filter(last_assessment_date__isnull=False).values(
+            'id', 'name', 'current_risk_level', 'current_risk_score', 'last_assessment_date',
+            'latest_ndvi', 'latest_soil_moisture', 'last_rain_date'
+        )
         
+        today = timezone.now().date()
+        summaries = []
         for region in regions:
-            # Get latest assessment
-            latest_assessment = DroughtRiskAssessment.objects.filter(
-                region=region
-            ).order_by('-assessment_date').first()
-            
-            if not latest_assessment:
-                continue
-            
-            # Get latest NDVI and soil moisture
-            latest_ndvi = NDVIData.objects.filter(
-                region=region
-            ).order_by('-date').first()
-            
-            latest_soil_moisture = SoilMoistureData.objects.filter(
-                region=region
-            ).order_by('-date').first()
-            
             # Calculate days since last rain
-            recent_weather = WeatherData.objects.filter(
-                region=region,
-                precipitation_mm__gt=1.0
-            ).order_by('-date').first()
-            
             days_since_rain = None
-            if recent_weather:
-                days_since_rain = (timezone.now().date() - recent_weather.date).days
+            if region['last_rain_date']:
+                days_since_rain = (today - region['last_rain_date']).days
             
             # Calculate trends (simplified)
             risk_trend = 'stable'  # Would need more complex calculation
             ndvi_trend = 'stable'  # Would need more complex calculation
             
             summary_data = {
-                'region_id': region.id,
-                'region_name': region.name,
-                'current_risk_level': latest_assessment.risk_level,
-                'current_risk_score': latest_assessment.risk_score,
-                'last_assessment_date': latest_assessment.assessment_date,
-                'latest_ndvi': latest_ndvi.ndvi_value if latest_ndvi else None,
-                'latest_soil_moisture': latest_soil_moisture.moisture_percent if latest_soil_moisture else None,
+                'region_id': region['id'],
+                'region_name': region['name'],
+                'current_risk_level': region['current_risk_level'],
+                'current_risk_score': region['current_risk_score'],
+                'last_assessment_date': region['last_assessment_date'],
+                'latest_ndvi': region['latest_ndvi'],
+                'latest_soil_moisture': region['latest_soil_moisture'],
                 'days_since_rain': days_since_rain,
                 'risk_trend': risk_trend,
                 'ndvi_trend': ndvi_trend,
@@ -307,41 +405,8 @@ class DroughtRiskAssessmentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def data_availability(self, request):
         """Check data availability status for all regions"""
-        availability_data = []
-        regions = Region.objects.all()
-        
-        for region in regions:
-            # Check data availability
-            has_ndvi = NDVIData.objects.filter(region=region).exists()
-            has_soil_moisture = SoilMoistureData.objects.filter(region=region).exists()
-            has_weather = WeatherData.objects.filter(region=region).exists()
-            has_assessment = DroughtRiskAssessment.objects.filter(region=region).exists()
-            
-            # Get latest dates
-            latest_ndvi = NDVIData.objects.filter(region=region).aggregate(latest=Max('date'))['latest']
-            latest_soil = SoilMoistureData.objects.filter(region=region).aggregate(latest=Max('date'))['latest']
-            latest_weather = WeatherData.objects.filter(region=region).aggregate(latest=Max('date'))['latest']
-            latest_assessment = DroughtRiskAssessment.objects.filter(region=region).aggregate(latest=Max('assessment_date'))['latest']
-            
-            # Calculate completeness score
-            completeness_score = sum([has_ndvi, has_soil_moisture, has_weather, has_assessment]) / 4.0
-            
-            availability_info = {
-                'region_id': region.id,
-                'region_name': region.name,
-                'has_ndvi_data': has_ndvi,
-                'has_soil_moisture_data': has_soil_moisture,
-                'has_weather_data': has_weather,
-                'has_risk_assessment': has_assessment,
-                'latest_ndvi_date': latest_ndvi,
-                'latest_soil_moisture_date': latest_soil,
-                'latest_weather_date': latest_weather,
-                'latest_assessment_date': latest_assessment,
-                'ndvi_data_quality': 'good' if has_ndvi else None,
-                'overall_data_completeness': completeness_score
-            }
-            
-            availability_data.append(availability_info)
+        # Read from the rollup table kept current by RegionDataAvailability.refresh()
+        availability_data = RegionDataAvailability.objects.select_related('region')
         
         serializer = DataAvailabilitySerializer(availability_data, many=True)
         return Response(serializer.data)
\ No newline at end of file
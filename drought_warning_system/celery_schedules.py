@@ -9,11 +9,32 @@ CELERY_BEAT_SCHEDULE = {
         'args': (),
     },
     
+    # Keep provider responses cached so the daily fetch and on-demand
+    # collections don't wait on the external APIs
+    'warm-provider-cache': {
+        'task': 'drought_data.tasks.warm_provider_cache',
+        'schedule': crontab(minute=15),  # Every hour at 15 minutes past
+    },
+    
     # Calculate drought risk daily at 7 AM (after data fetch) - NEW AUTOMATED TASK
     'calculate-daily-drought-risk': {
         'task': 'drought_data.automated_tasks.calculate_daily_drought_risk',
         'schedule': crontab(hour=7, minute=0),  # 7:00 AM daily
         'args': (),
+        'kwargs': {'parallel': True},  # One subtask per region
+    },
+    
+    # Rebuild the drought time series view every hour, after the daily
+    # data fetch and any risk recalculation
+    'refresh-drought-time-series': {
+        'task': 'drought_data.tasks.refresh_drought_time_series',
+        'schedule': crontab(minute=45),  # Every hour at 45 minutes past
+    },
+    
+    # Refresh the per-region data availability rollup hourly
+    'refresh-data-availability': {
+        'task': 'drought_data.tasks.refresh_data_availability',
+        'schedule': crontab(minute=50),  # Every hour at 50 minutes past
     },
     
     # Trigger drought alerts daily at 7:30 AM (after risk calculation) - NEW AUTOMATED TASK
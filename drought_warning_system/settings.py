@@ -164,6 +164,10 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 50,
 }
@@ -187,6 +191,17 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
+# Data fetches and risk calculations are long-running, so each worker process
+# reserves one task at a time instead of hoarding queued work
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Cache shared by all web and worker processes, on its own Redis database
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": f"redis://:{REDIS_PASSWORD}@{REDIS_HOST}:{REDIS_PORT}/1",
+    }
+}
 
 # Logging
 LOGGING = {
@@ -212,6 +227,11 @@ LOGGING = {
 GOOGLE_EARTH_ENGINE_KEY = os.getenv("GOOGLE_EARTH_ENGINE_KEY")
 NASA_POWER_API_KEY = os.getenv("NASA_POWER_API_KEY")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+# Regions collected at once by DataIntegrationService.collect_all_data_for_regions,
+# and concurrent OpenWeatherMap calls allowed under its free-tier rate limit
+DATA_FETCH_CONCURRENCY = int(os.getenv("DATA_FETCH_CONCURRENCY", 8))
+DATA_FETCH_TIMEOUT = int(os.getenv("DATA_FETCH_TIMEOUT", 120))  # seconds per batch
+OPENWEATHER_CONCURRENCY = int(os.getenv("OPENWEATHER_CONCURRENCY", 2))
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_WHATSAPP_NUMBER = os.getenv("TWILIO_WHATSAPP_NUMBER")
@@ -3,8 +3,9 @@ Report generators for PDF and Excel export functionality
 """
 import io
 import csv
+import itertools
 from datetime import datetime, timedelta
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.db.models import Count, Avg, Q
@@ -24,6 +25,16 @@ from drought_data.models import DroughtRiskAssessment, WeatherData, NDVIData
 from farmers.models import FarmerProfile
 from ussd.models import USSDSession, USSDUser
 
+# Rows fetched per database round trip when streaming CSV exports
+CSV_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """Pseudo-buffer whose write() returns the value, so csv.writer rows can be streamed"""
+    
+    def write(self, value):
+        return value
+
 
 class DroughtReportGenerator:
     """Generate comprehensive drought monitoring reports"""
@@ -33,20 +44,29 @@ class DroughtReportGenerator:
         self.start_date = start_date or (self.end_date - timedelta(days=30))
     
     def generate_csv_report(self, report_type='summary'):
-        """Generate CSV report"""
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="drought_report_{report_type}_{self.start_date}_to_{self.end_date}.csv"'
-        
-        writer = csv.writer(response)
-        
+        """Generate CSV report, streamed row by row"""
         if report_type == 'summary':
-            self._write_summary_csv(writer)
+            rows = self._summary_csv_rows()
         elif report_type == 'assessments':
-            self._write_assessments_csv(writer)
+            rows = self._assessments_csv_rows()
         elif report_type == 'alerts':
-            self._write_alerts_csv(writer)
+            rows = self._alerts_csv_rows()
         elif report_type == 'weather':
-            self._write_weather_csv(writer)
+            rows = self._weather_csv_rows()
+        else:
+            rows = iter([])
+        
+        # Run up to the first row so that invalid report queries fail here,
+        # before the response starts streaming
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = itertools.chain([first_row], rows)
+        
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in rows), content_type='text/csv'
+        )
+        response['Content-Disposition'] = f'attachment; filename="drought_report_{report_type}_{self.start_date}_to_{self.end_date}.csv"'
         
         return response
     
@@ -109,16 +129,16 @@ class DroughtReportGenerator:
         
         return response
     
-    def _write_summary_csv(self, writer):
-        """Write summary data to CSV"""
-        writer.writerow(['Drought Monitoring Summary Report'])
-        writer.writerow(['Period', f'{self.start_date} to {self.end_date}'])
-        writer.writerow(['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
+    def _summary_csv_rows(self):
+        """Summary data CSV rows"""
+        yield ['Drought Monitoring Summary Report']
+        yield ['Period', f'{self.start_date} to {self.end_date}']
+        yield ['Generated', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        yield []
         
         # Regional summary
-        writer.writerow(['Regional Summary'])
-        writer.writerow(['Region', 'Latest Risk Score', 'Risk Level', 'Alerts Sent', 'Last Assessment'])
+        yield ['Regional Summary']
+        yield ['Region', 'Latest Risk Score', 'Risk Level', 'Alerts Sent', 'Last Assessment']
         
         regions = Region.objects.filter(region_type='county')
         for region in regions:
@@ -133,30 +153,30 @@ class DroughtReportGenerator:
             ).count()
             
             if latest_assessment:
-                writer.writerow([
+                yield [
                     region.name,
                     f"{latest_assessment.risk_score:.1f}",
                     latest_assessment.get_risk_level_display(),
                     alerts_count,
                     latest_assessment.assessment_date
-                ])
+                ]
             else:
-                writer.writerow([region.name, 'No data', 'No data', alerts_count, 'No assessment'])
+                yield [region.name, 'No data', 'No data', alerts_count, 'No assessment']
     
-    def _write_assessments_csv(self, writer):
-        """Write drought assessments to CSV"""
-        writer.writerow([
-            'Assessment ID', 'Region', 'Date', 'Risk Score', 'Risk Level',
-            'NDVI Score', 'Soil Moisture Score', 'Weather Score',
-            'Predicted 7-day Risk', 'Predicted 30-day Risk', 'Confidence'
-        ])
-        
+    def _assessments_csv_rows(self):
+        """Drought assessment CSV rows"""
         assessments = DroughtRiskAssessment.objects.filter(
             assessment_date__range=[self.start_date, self.end_date]
         ).select_related('region').order_by('-assessment_date')
         
-        for assessment in assessments:
-            writer.writerow([
+        yield [
+            'Assessment ID', 'Region', 'Date', 'Risk Score', 'Risk Level',
+            'NDVI Score', 'Soil Moisture Score', 'Weather Score',
+            'Predicted 7-day Risk', 'Predicted 30-day Risk', 'Confidence'
+        ]
+        
+        for assessment in assessments.iterator(chunk_size=CSV_CHUNK_SIZE):
+            yield [
                 assessment.id,
                 assessment.region.name,
                 assessment.assessment_date,
@@ -168,21 +188,21 @@ class DroughtReportGenerator:
                 f"{assessment.predicted_risk_7_days:.1f}" if assessment.predicted_risk_7_days else 'N/A',
                 f"{assessment.predicted_risk_30_days:.1f}" if assessment.predicted_risk_30_days else 'N/A',
                 f"{assessment.confidence_score:.2f}"
-            ])
+            ]
     
-    def _write_alerts_csv(self, writer):
-        """Write alerts data to CSV"""
-        writer.writerow([
-            'Alert ID', 'Region', 'Title', 'Type', 'Severity', 'Priority',
-            'Status', 'Created Date', 'Sent Date', 'Recipients', 'Successful', 'Failed'
-        ])
-        
+    def _alerts_csv_rows(self):
+        """Alert CSV rows"""
         alerts = Alert.objects.filter(
             created_at__date__range=[self.start_date, self.end_date]
         ).select_related('region').order_by('-created_at')
         
-        for alert in alerts:
-            writer.writerow([
+        yield [
+            'Alert ID', 'Region', 'Title', 'Type', 'Severity', 'Priority',
+            'Status', 'Created Date', 'Sent Date', 'Recipients', 'Successful', 'Failed'
+        ]
+        
+        for alert in alerts.iterator(chunk_size=CSV_CHUNK_SIZE):
+            yield [
                 alert.alert_id,
                 alert.region.name,
                 alert.title,
@@ -195,21 +215,21 @@ class DroughtReportGenerator:
                 alert.total_recipients,
                 alert.successfully_sent,
                 alert.failed_sends
-            ])
+            ]
     
-    def _write_weather_csv(self, writer):
-        """Write weather data to CSV"""
-        writer.writerow([
-            'Region', 'Date', 'Temperature', 'Humidity', 'Rainfall',
-            'Wind Speed', 'Solar Radiation', 'Barometric Pressure'
-        ])
-        
+    def _weather_csv_rows(self):
+        """Weather data CSV rows"""
         weather_data = WeatherData.objects.filter(
             timestamp__date__range=[self.start_date, self.end_date]
         ).select_related('region').order_by('-timestamp')
         
-        for data in weather_data:
-            writer.writerow([
+        yield [
+            'Region', 'Date', 'Temperature', 'Humidity', 'Rainfall',
+            'Wind Speed', 'Solar Radiation', 'Barometric Pressure'
+        ]
+        
+        for data in weather_data.iterator(chunk_size=CSV_CHUNK_SIZE):
+            yield [
                 data.region.name,
                 data.timestamp.date(),
                 f"{data.temperature:.1f}" if data.temperature else 'N/A',
@@ -218,7 +238,7 @@ class DroughtReportGenerator:
                 f"{data.wind_speed:.1f}" if data.wind_speed else 'N/A',
                 f"{data.solar_radiation:.1f}" if data.solar_radiation else 'N/A',
                 f"{data.barometric_pressure:.1f}" if data.barometric_pressure else 'N/A'
-            ])
+            ]
     
     def _add_summary_sheet(self, wb):
         """Add summary sheet to Excel workbook"""